@@ -3,10 +3,19 @@ AI Scientist Lab Notebook - Workers
 FastAPI application for background processing workers
 """
 
+import os
+from typing import List
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, Response
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
 import structlog
 
+from .middleware import ISALGZipMiddleware
+from .workers.bundle_worker import BundleBatchRequest, BundleRequest, BundleResult, BundleWorker
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -43,6 +52,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON bundle responses
+app.add_middleware(ISALGZipMiddleware, minimum_size=1000, compresslevel=1)
+
+bundle_worker = BundleWorker()
+
+# Serializes worker results directly; they are trusted and never re-validated
+_BUNDLE_RESULTS = TypeAdapter(List[BundleResult])
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -53,6 +70,35 @@ async def root():
     """Root endpoint"""
     return {"message": "AI Scientist Lab Notebook Workers"}
 
+@app.post("/bundles/batch", response_class=Response)
+async def create_bundles_batch(batch: BundleBatchRequest):
+    """Create several bundles in one request"""
+    results = await bundle_worker.create_bundles(batch.requests, batch.data_sources)
+    return Response(_BUNDLE_RESULTS.dump_json(results), media_type="application/json")
+
+@app.post("/bundles/zip")
+async def create_zip_bundle(request: BundleRequest):
+    """Build a ZIP bundle on disk and send it, deleting the file once sent"""
+    zip_path = await bundle_worker.spool_zip_bundle(request.spec, request.data_sources)
+    return FileResponse(
+        zip_path,
+        media_type="application/zip",
+        filename=f"{request.spec.bundle_id}.zip",
+        background=BackgroundTask(os.unlink, zip_path)
+    )
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+
+    # Bundle generation is CPU-bound: one process per core, and each
+    # process sizes its pools to its share of the cores (see cpu_share)
+    workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "src.main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools"
+    )
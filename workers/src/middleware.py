@@ -0,0 +1,70 @@
+"""
+HTTP middleware for the workers application
+"""
+
+import io
+
+from isal import igzip
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Bodies that are already compressed; gzipping them again only costs CPU
+# and drops Content-Length (and with it range requests)
+PRECOMPRESSED_MEDIA_TYPES = frozenset({
+    "application/zip",
+    "application/gzip",
+    "application/zstd",
+    "application/vnd.apache.parquet",
+    "image/png",
+    "image/jpeg",
+    "image/webp",
+})
+
+
+class ISALGZipResponder(GZipResponder):
+    """GZip responder that compresses with ISA-L instead of stdlib zlib"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int, compresslevel: int = 1) -> None:
+        super().__init__(app, minimum_size, compresslevel=compresslevel)
+        self.gzip_buffer = io.BytesIO()
+        # mtime=0 keeps the gzip header deterministic for identical bodies
+        self.gzip_file = igzip.IGzipFile(
+            mode="wb", fileobj=self.gzip_buffer, compresslevel=compresslevel, mtime=0
+        )
+        self.passthrough = False
+
+    async def send_with_gzip(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            self.passthrough = content_type.split(";", 1)[0].strip().lower() in PRECOMPRESSED_MEDIA_TYPES
+        if self.passthrough:
+            # Headers (Content-Length, ranges) and body go out untouched
+            await self.send(message)
+            return
+        await super().send_with_gzip(message)
+
+
+class ISALGZipMiddleware(GZipMiddleware):
+    """
+    Gzip responses for clients sending Accept-Encoding: gzip
+
+    ISA-L level 1 gives roughly zlib level 6 ratios at several times the
+    speed, which matters for multi-megabyte JSON bundles. Responses whose
+    media type is already compressed (ZIP archives, PNGs, Parquet) are
+    passed through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 500, compresslevel: int = 1) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = ISALGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
@@ -1,3 +1,3 @@
-from .bundle_worker import BundleWorker
+from .bundle_worker import BundleBatchRequest, BundleRequest, BundleResult, BundleSpec, BundleWorker, Relationship
 
-__all__ = ["BundleWorker"]
+__all__ = ["BundleWorker", "BundleSpec", "BundleResult", "BundleBatchRequest", "BundleRequest", "Relationship"]
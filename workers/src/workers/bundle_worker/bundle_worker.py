@@ -6,20 +6,218 @@ with documents, chunks, tables, datasets, experiments, answers, citations, and p
 """
 
 import asyncio
-import json
-import zipfile
+import base64
+import hashlib
 import io
-from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from itertools import chain
+from typing import Awaitable, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple, Union
+from datetime import datetime, timezone
 from pathlib import Path
 
-import pandas as pd
-from pydantic import BaseModel, Field
+import jinja2
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel, Field, field_serializer, model_validator
 
 import structlog
 
+from ..concurrency import cpu_share
+from .zip_stream import ZipStreamWriter, compress_entry
+
 logger = structlog.get_logger(__name__)
 
+# (archive name, method, compressed payload, crc32, uncompressed size)
+CompressedEntry = Tuple[str, int, bytes, int, int]
+
+# Relationship types, interned once so every edge shares the same string
+REL_DOCUMENT_CONTAINS_CHUNK = sys.intern("document_contains_chunk")
+REL_ANSWER_CITES = sys.intern("answer_cites")
+REL_EXPERIMENT_FROM_DOCUMENT = sys.intern("experiment_from_document")
+REL_PLOT_VISUALIZES_DATASET = sys.intern("plot_visualizes_dataset")
+
+# Relationship edge: (type, source, target, metadata)
+Edge = Tuple[str, Any, Any, Dict[str, Any]]
+
+
+@dataclass(slots=True, frozen=True)
+class Relationship:
+    """Edge between two bundle components; slotted to keep large graphs compact"""
+    type: str
+    source: Any
+    target: Any
+    metadata: Dict[str, Any]
+
+# Autoescaped report templates, loaded and compiled once per process
+_TEMPLATES = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=True,
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+_REPORT_TEMPLATE = _TEMPLATES.get_template("bundle_report.html.j2")
+
+DEFAULT_DESCRIPTION = "AI Scientist Lab Notebook Bundle"
+
+# Static README layout; only the header and counts vary per bundle
+_README_TEMPLATE = "\n".join([
+    "# {title}",
+    "",
+    "{description}",
+    "",
+    "**Bundle ID:** {bundle_id}",
+    "**Created:** {created_at}",
+    "**Workspace:** {workspace_id}",
+    "",
+    "## Contents",
+    "",
+    "- **Documents:** {doc_count}",
+    "- **Datasets:** {dataset_count}",
+    "- **Experiments:** {exp_count}",
+    "- **Q&A Sessions:** {answer_count}",
+    "- **Plots:** {plot_count}",
+    "",
+    "## Structure",
+    "",
+    "This bundle contains the following directories:",
+    "",
+    "- `documents/` - Document metadata and chunks",
+    "- `datasets/` - Dataset metadata and raw data (`data.parquet`, zstd-compressed Parquet)",
+    "- `experiments/` - Experiment summaries",
+    "- `answers/` - Q&A sessions with citations",
+    "- `plots/` - Plot specifications and code",
+    "- `relationships.jsonl` - Relationships between components (one JSON record per line)",
+    "",
+    "## Usage",
+    "",
+    "1. Extract the ZIP file",
+    "2. Open `bundle.json` for an overview",
+    "3. Navigate to specific directories for detailed data",
+    "4. Use the Python code in `plots/` to recreate visualizations",
+    "",
+    "## Relationships",
+    "",
+    "The `relationships.jsonl` file contains connections between:",
+    "- Documents and their chunks",
+    "- Answers and their citations",
+    "- Experiments and source documents",
+    "- Plots and their datasets"
+])
+
+# Archive entry holding one relationship record per line
+RELATIONSHIPS_ENTRY = "relationships.jsonl"
+
+# Shared by all bundle builds in the process. DEFLATE/zstd release the GIL,
+# so threads compress entries in parallel without pickling payloads to subprocesses
+_COMPRESSION_POOL = ThreadPoolExecutor(max_workers=cpu_share(), thread_name_prefix="bundle-zip")
+
+# Write buffer for spooled ZIP archives
+ZIP_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Bundles with more components than this render their reports off the event loop
+LARGE_BUNDLE_COMPONENTS = 1000
+
+_JSON_OPTIONS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NAIVE_UTC
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+# Compact single-line records for NDJSON entries
+_JSONL_OPTIONS = (
+    orjson.OPT_APPEND_NEWLINE
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NAIVE_UTC
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+# Compact, key-sorted JSON hashed to key the serialized entry cache
+_DIGEST_OPTIONS = (
+    orjson.OPT_SORT_KEYS
+    | orjson.OPT_SERIALIZE_NUMPY
+    | orjson.OPT_NAIVE_UTC
+    | orjson.OPT_NON_STR_KEYS
+)
+
+
+# Most bundles accepted in one batch request
+MAX_BATCH_BUNDLES = 32
+
+
+# Timestamp shared by every spec/result created within one batch
+_BATCH_NOW: ContextVar[Optional[datetime]] = ContextVar("bundle_batch_now", default=None)
+
+
+def _now() -> datetime:
+    """Current batch timestamp, or the current UTC time outside a batch"""
+    return _BATCH_NOW.get() or datetime.now(timezone.utc)
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a bundle entry to indented JSON bytes"""
+    return orjson.dumps(obj, default=str, option=_JSON_OPTIONS)
+
+
+def _encode_text(text: str) -> bytes:
+    """Encode a text entry for the archive"""
+    return text.encode("utf-8")
+
+
+class SerializedEntryCache:
+    """
+    Thread-safe LRU of serialized ZIP entries, bounded by total bytes
+
+    Entries are keyed by a BLAKE2b digest of the value's compact JSON, so an
+    edited entity never hits a stale entry, and repeat exports of unchanged
+    data skip the indented re-serialization.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self._max_bytes = max_bytes
+        self._size = 0
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, value: Any) -> bytes:
+        """Return cached bytes for value, serializing it on a miss"""
+        key = hashlib.blake2b(
+            orjson.dumps(value, default=str, option=_DIGEST_OPTIONS), digest_size=16
+        ).digest()
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                return data
+
+        data = _dumps(value)
+        if len(data) > self._max_bytes:
+            return data
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = data
+                self._size += len(data)
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
 
 class BundleSpec(BaseModel):
     """Bundle specification schema"""
@@ -35,7 +233,8 @@ class BundleSpec(BaseModel):
     include_metadata: bool = True
     include_raw_data: bool = False
     export_format: str = "json"  # json, zip, pdf, html
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    compression: str = "deflate"  # deflate, zstd, stored (zip only)
+    created_at: datetime = Field(default_factory=_now)
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
@@ -48,7 +247,46 @@ class BundleResult(BaseModel):
     pdf_data: Optional[bytes] = None
     html_data: Optional[str] = None
     error: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_now)
+
+    @classmethod
+    def for_spec(cls, spec: BundleSpec, **fields: Any) -> "BundleResult":
+        """
+        Build a result for an already-validated spec
+
+        Worker output is trusted, so this skips pydantic validation of the
+        (potentially large) bundle payload via model_construct.
+        """
+        return cls.model_construct(bundle_id=spec.bundle_id, spec=spec, **fields)
+
+    @field_serializer("zip_data", "pdf_data", when_used="json")
+    def _serialize_binary(self, data: Optional[bytes]) -> Optional[str]:
+        # Archives aren't UTF-8, so JSON carries them as standard base64
+        return base64.b64encode(data).decode("ascii") if data else data
+
+
+class BundleRequest(BaseModel):
+    """One bundle specification with the data sources it is resolved against"""
+    spec: BundleSpec
+    data_sources: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BundleBatchRequest(BaseModel):
+    """Several bundle specifications resolved against shared data sources"""
+    requests: List[BundleSpec] = Field(max_length=MAX_BATCH_BUNDLES)
+    data_sources: Dict[str, Any] = Field(default_factory=dict)
+
+    @model_validator(mode="wrap")
+    @classmethod
+    def _stamp_batch(cls, data: Any, handler: Callable[[Any], "BundleBatchRequest"]) -> "BundleBatchRequest":
+        """Give every spec parsed from one request the same created_at"""
+        if _BATCH_NOW.get() is not None:
+            return handler(data)
+        token = _BATCH_NOW.set(datetime.now(timezone.utc))
+        try:
+            return handler(data)
+        finally:
+            _BATCH_NOW.reset(token)
 
 
 class BundleWorker:
@@ -56,6 +294,16 @@ class BundleWorker:
     
     def __init__(self):
         self.logger = logger.bind(worker="bundle")
+        # Caps concurrent CPU-bound archive builds running in worker threads
+        self._build_limiter = asyncio.Semaphore(cpu_share())
+        self._entry_cache = SerializedEntryCache()
+        # Export format -> builder; register new formats here
+        self._formats: Dict[str, Callable[[BundleSpec, Dict[str, Any]], Awaitable[BundleResult]]] = {
+            "json": self._create_json_bundle,
+            "zip": self._create_zip_bundle,
+            "pdf": self._create_pdf_bundle,
+            "html": self._create_html_bundle,
+        }
     
     async def create_bundle(self, spec: BundleSpec, data_sources: Dict[str, Any]) -> BundleResult:
         """
@@ -75,28 +323,48 @@ class BundleWorker:
             bundle_data = await self._collect_bundle_data(spec, data_sources)
             
             # Generate output based on format
-            if spec.export_format == "json":
-                return await self._create_json_bundle(spec, bundle_data)
-            elif spec.export_format == "zip":
-                return await self._create_zip_bundle(spec, bundle_data)
-            elif spec.export_format == "pdf":
-                return await self._create_pdf_bundle(spec, bundle_data)
-            elif spec.export_format == "html":
-                return await self._create_html_bundle(spec, bundle_data)
-            else:
+            handler = self._formats.get(spec.export_format)
+            if handler is None:
                 raise ValueError(f"Unsupported export format: {spec.export_format}")
+            return await handler(spec, bundle_data)
                 
         except Exception as e:
             self.logger.error("Failed to create bundle", bundle_id=spec.bundle_id, error=str(e))
-            return BundleResult(
-                bundle_id=spec.bundle_id,
-                spec=spec,
-                error=str(e)
-            )
+            return BundleResult.for_spec(spec, error=str(e))
+    
+    async def create_bundles(self, specs: List[BundleSpec], data_sources: Dict[str, Any],
+                             max_concurrency: int = 8) -> List[BundleResult]:
+        """
+        Create several bundles concurrently
+
+        Args:
+            specs: Bundle specifications
+            data_sources: Data sources shared by every bundle in the batch
+            max_concurrency: Upper bound on bundles built at the same time
+
+        Returns:
+            One result per spec, in request order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _create(spec: BundleSpec) -> BundleResult:
+            async with semaphore:
+                return await self.create_bundle(spec, data_sources)
+
+        # Tasks copy the current context, so all results share one timestamp
+        token = _BATCH_NOW.set(_now())
+        try:
+            return list(await asyncio.gather(*(_create(spec) for spec in specs)))
+        finally:
+            _BATCH_NOW.reset(token)
     
     async def _collect_bundle_data(self, spec: BundleSpec, data_sources: Dict[str, Any]) -> Dict[str, Any]:
         """
         Collect all data for the bundle based on specification
+
+        Loop-invariant options are hoisted so each entity list is built by a
+        single comprehension; relationship edges are derived from those
+        lists, walking each chunk and citation list once.
         
         Args:
             spec: Bundle specification
@@ -119,455 +387,351 @@ class BundleWorker:
             "plots": [],
             "relationships": []
         }
-        
+
         # Collect documents
-        if spec.document_ids:
-            documents = data_sources.get("documents", {})
-            for doc_id in spec.document_ids:
-                if doc_id in documents:
-                    doc_data = documents[doc_id]
-                    if spec.include_metadata:
-                        bundle_data["documents"].append({
-                            "id": doc_id,
-                            "title": doc_data.get("title"),
-                            "filename": doc_data.get("filename"),
-                            "metadata": doc_data.get("metadata", {}),
-                            "chunks": doc_data.get("chunks", [])
-                        })
-                    else:
-                        bundle_data["documents"].append({
-                            "id": doc_id,
-                            "title": doc_data.get("title"),
-                            "filename": doc_data.get("filename")
-                        })
+        documents = data_sources.get("documents", {})
+        if spec.include_metadata:
+            bundle_data["documents"] = [
+                {
+                    "id": doc_id,
+                    "title": doc_data.get("title"),
+                    "filename": doc_data.get("filename"),
+                    "metadata": doc_data.get("metadata", {}),
+                    "chunks": doc_data.get("chunks", [])
+                }
+                for doc_id in spec.document_ids
+                if (doc_data := documents.get(doc_id)) is not None
+            ]
+        else:
+            bundle_data["documents"] = [
+                {
+                    "id": doc_id,
+                    "title": doc_data.get("title"),
+                    "filename": doc_data.get("filename")
+                }
+                for doc_id in spec.document_ids
+                if (doc_data := documents.get(doc_id)) is not None
+            ]
         
         # Collect datasets
-        if spec.dataset_ids:
-            datasets = data_sources.get("datasets", {})
-            for dataset_id in spec.dataset_ids:
-                if dataset_id in datasets:
-                    dataset_data = datasets[dataset_id]
-                    if spec.include_raw_data:
-                        bundle_data["datasets"].append(dataset_data)
-                    else:
-                        bundle_data["datasets"].append({
-                            "id": dataset_id,
-                            "name": dataset_data.get("name"),
-                            "description": dataset_data.get("description"),
-                            "schema": dataset_data.get("schema"),
-                            "row_count": dataset_data.get("row_count"),
-                            "metadata": dataset_data.get("metadata", {})
-                        })
+        datasets = data_sources.get("datasets", {})
+        if spec.include_raw_data:
+            bundle_data["datasets"] = [
+                dataset_data
+                for dataset_id in spec.dataset_ids
+                if (dataset_data := datasets.get(dataset_id)) is not None
+            ]
+        else:
+            bundle_data["datasets"] = [
+                {
+                    "id": dataset_id,
+                    "name": dataset_data.get("name"),
+                    "description": dataset_data.get("description"),
+                    "schema": dataset_data.get("schema"),
+                    "row_count": dataset_data.get("row_count"),
+                    "metadata": dataset_data.get("metadata", {})
+                }
+                for dataset_id in spec.dataset_ids
+                if (dataset_data := datasets.get(dataset_id)) is not None
+            ]
         
         # Collect experiments
-        if spec.experiment_ids:
-            experiments = data_sources.get("experiments", {})
-            for exp_id in spec.experiment_ids:
-                if exp_id in experiments:
-                    bundle_data["experiments"].append(experiments[exp_id])
+        experiments = data_sources.get("experiments", {})
+        bundle_data["experiments"] = [
+            exp
+            for exp_id in spec.experiment_ids
+            if (exp := experiments.get(exp_id)) is not None
+        ]
         
         # Collect answers
-        if spec.answer_ids:
-            answers = data_sources.get("answers", {})
-            for answer_id in spec.answer_ids:
-                if answer_id in answers:
-                    answer_data = answers[answer_id]
-                    bundle_data["answers"].append({
-                        "id": answer_id,
-                        "question": answer_data.get("question"),
-                        "answer": answer_data.get("answer"),
-                        "confidence": answer_data.get("confidence"),
-                        "citations": answer_data.get("citations", []),
-                        "created_at": answer_data.get("created_at")
-                    })
+        answers = data_sources.get("answers", {})
+        bundle_data["answers"] = [
+            {
+                "id": answer_id,
+                "question": answer_data.get("question"),
+                "answer": answer_data.get("answer"),
+                "confidence": answer_data.get("confidence"),
+                "citations": answer_data.get("citations", []),
+                "created_at": answer_data.get("created_at")
+            }
+            for answer_id in spec.answer_ids
+            if (answer_data := answers.get(answer_id)) is not None
+        ]
         
         # Collect plots
-        if spec.plot_ids:
-            plots = data_sources.get("plots", {})
-            for plot_id in spec.plot_ids:
-                if plot_id in plots:
-                    plot_data = plots[plot_id]
-                    bundle_data["plots"].append({
-                        "id": plot_id,
-                        "title": plot_data.get("title"),
-                        "plot_type": plot_data.get("plot_type"),
-                        "spec": plot_data.get("spec"),
-                        "python_code": plot_data.get("python_code"),
-                        "created_at": plot_data.get("created_at")
-                    })
+        plots = data_sources.get("plots", {})
+        bundle_data["plots"] = [
+            {
+                "id": plot_id,
+                "title": plot_data.get("title"),
+                "plot_type": plot_data.get("plot_type"),
+                "spec": plot_data.get("spec"),
+                "python_code": plot_data.get("python_code"),
+                "created_at": plot_data.get("created_at")
+            }
+            for plot_id in spec.plot_ids
+            if (plot_data := plots.get(plot_id)) is not None
+        ]
+
+        # Edges as (type, source, target, metadata), grouped by relationship type
+        chunk_edges: List[Edge] = [
+            (
+                REL_DOCUMENT_CONTAINS_CHUNK,
+                doc["id"],
+                chunk.get("id"),
+                {"chunk_index": chunk.get("index"), "page_range": chunk.get("page_range")}
+            )
+            for doc in bundle_data["documents"]
+            for chunk in doc.get("chunks", ())
+        ]
+        citation_edges: List[Edge] = [
+            (
+                REL_ANSWER_CITES,
+                answer["id"],
+                citation.get("document_id"),
+                {
+                    "chunk_id": citation.get("chunk_id"),
+                    "page": citation.get("page"),
+                    "score": citation.get("score")
+                }
+            )
+            for answer in bundle_data["answers"]
+            for citation in answer["citations"]
+        ]
+        experiment_edges: List[Edge] = [
+            (REL_EXPERIMENT_FROM_DOCUMENT, exp["id"], doc_id, {"confidence": exp.get("confidence_score")})
+            for exp in bundle_data["experiments"]
+            for doc_id in exp.get("document_ids", [])
+        ]
+        plot_edges: List[Edge] = [
+            (
+                REL_PLOT_VISUALIZES_DATASET,
+                plot["id"],
+                data_source,
+                {"plot_type": plot["plot_type"], "columns": [plot_spec.get("x_column"), plot_spec.get("y_column")]}
+            )
+            for plot in bundle_data["plots"]
+            if (data_source := (plot_spec := plot["spec"] or {}).get("data_source"))
+        ]
         
         # Build relationships
-        bundle_data["relationships"] = await self._build_relationships(bundle_data)
+        bundle_data["relationships"] = self._build_relationships(
+            chain(chunk_edges, citation_edges, experiment_edges, plot_edges)
+        )
         
         return bundle_data
     
-    async def _build_relationships(self, bundle_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Build relationships between bundle components"""
-        relationships = []
-        
-        # Document -> Chunk relationships
-        for doc in bundle_data["documents"]:
-            for chunk in doc.get("chunks", []):
-                relationships.append({
-                    "type": "document_contains_chunk",
-                    "source": doc["id"],
-                    "target": chunk.get("id"),
-                    "metadata": {
-                        "chunk_index": chunk.get("index"),
-                        "page_range": chunk.get("page_range")
-                    }
-                })
-        
-        # Answer -> Citation relationships
-        for answer in bundle_data["answers"]:
-            for citation in answer.get("citations", []):
-                relationships.append({
-                    "type": "answer_cites",
-                    "source": answer["id"],
-                    "target": citation.get("document_id"),
-                    "metadata": {
-                        "chunk_id": citation.get("chunk_id"),
-                        "page": citation.get("page"),
-                        "score": citation.get("score")
-                    }
-                })
-        
-        # Experiment -> Document relationships
-        for exp in bundle_data["experiments"]:
-            for doc_id in exp.get("document_ids", []):
-                relationships.append({
-                    "type": "experiment_from_document",
-                    "source": exp["id"],
-                    "target": doc_id,
-                    "metadata": {
-                        "confidence": exp.get("confidence_score")
-                    }
-                })
-        
-        # Plot -> Dataset relationships
-        for plot in bundle_data["plots"]:
-            spec = plot.get("spec", {})
-            data_source = spec.get("data_source")
-            if data_source:
-                relationships.append({
-                    "type": "plot_visualizes_dataset",
-                    "source": plot["id"],
-                    "target": data_source,
-                    "metadata": {
-                        "plot_type": plot["plot_type"],
-                        "columns": [spec.get("x_column"), spec.get("y_column")]
-                    }
-                })
-        
-        return relationships
+    def _build_relationships(self, edges: Iterable[Edge]) -> List[Relationship]:
+        """Materialize collected edges as relationship records"""
+        return [Relationship(*edge) for edge in edges]
     
     async def _create_json_bundle(self, spec: BundleSpec, bundle_data: Dict[str, Any]) -> BundleResult:
         """Create JSON bundle"""
-        return BundleResult(
-            bundle_id=spec.bundle_id,
-            spec=spec,
-            bundle_data=bundle_data
-        )
+        return BundleResult.for_spec(spec, bundle_data=bundle_data)
     
-    async def _create_zip_bundle(self, spec: BundleSpec, bundle_data: Dict[str, Any]) -> BundleResult:
-        """Create ZIP bundle with all data and files"""
-        zip_buffer = io.BytesIO()
-        
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Add bundle metadata
-            zip_file.writestr(
-                "bundle.json",
-                json.dumps(bundle_data, indent=2, default=str)
-            )
-            
-            # Add README
-            readme_content = self._generate_readme(bundle_data)
-            zip_file.writestr("README.md", readme_content)
-            
-            # Add documents
-            for doc in bundle_data.get("documents", []):
-                doc_dir = f"documents/{doc['id']}"
-                zip_file.writestr(f"{doc_dir}/metadata.json", json.dumps(doc, indent=2, default=str))
-                
-                # Add chunks if available
-                for chunk in doc.get("chunks", []):
-                    zip_file.writestr(
-                        f"{doc_dir}/chunks/{chunk.get('id', 'chunk')}.json",
-                        json.dumps(chunk, indent=2, default=str)
-                    )
-            
-            # Add datasets
-            for dataset in bundle_data.get("datasets", []):
-                dataset_dir = f"datasets/{dataset['id']}"
-                zip_file.writestr(f"{dataset_dir}/metadata.json", json.dumps(dataset, indent=2, default=str))
-                
-                # Add raw data if available
-                if "data" in dataset:
-                    df = pd.DataFrame(dataset["data"])
-                    csv_buffer = io.StringIO()
-                    df.to_csv(csv_buffer, index=False)
-                    zip_file.writestr(f"{dataset_dir}/data.csv", csv_buffer.getvalue())
-            
-            # Add experiments
-            for exp in bundle_data.get("experiments", []):
-                zip_file.writestr(
-                    f"experiments/{exp['id']}.json",
-                    json.dumps(exp, indent=2, default=str)
-                )
-            
-            # Add answers
-            for answer in bundle_data.get("answers", []):
-                zip_file.writestr(
-                    f"answers/{answer['id']}.json",
-                    json.dumps(answer, indent=2, default=str)
-                )
-            
-            # Add plots
-            for plot in bundle_data.get("plots", []):
-                plot_dir = f"plots/{plot['id']}"
-                zip_file.writestr(f"{plot_dir}/metadata.json", json.dumps(plot, indent=2, default=str))
-                
-                # Add Python code
-                if plot.get("python_code"):
-                    zip_file.writestr(f"{plot_dir}/plot_code.py", plot["python_code"])
-            
-            # Add relationships
-            zip_file.writestr(
-                "relationships.json",
-                json.dumps(bundle_data.get("relationships", []), indent=2, default=str)
-            )
-        
-        return BundleResult(
-            bundle_id=spec.bundle_id,
-            spec=spec,
-            zip_data=zip_buffer.getvalue()
+    async def _create_zip_bundle(self, spec: BundleSpec, bundle_data: Dict[str, Any],
+                                 output: Optional[BinaryIO] = None) -> BundleResult:
+        """
+        Create ZIP bundle with all data and files
+
+        Entries are serialized and compressed in parallel first, then framed sequentially
+        into ``output`` (any object with a write() method, e.g. an open file
+        or an S3 multipart uploader). When no output is given the archive is
+        returned in zip_data; use spool_zip_bundle to keep large archives on disk.
+        """
+        async with self._build_limiter:
+            entries = await self._serialize_entries(bundle_data, spec.compression)
+            sink = output if output is not None else io.BytesIO()
+            await asyncio.to_thread(self._write_zip, sink, spec, entries, bundle_data["relationships"])
+
+        if output is not None:
+            return BundleResult.for_spec(spec)
+        return BundleResult.for_spec(spec, zip_data=sink.getvalue())
+
+    async def spool_zip_bundle(self, spec: BundleSpec, data_sources: Dict[str, Any]) -> str:
+        """
+        Build a ZIP bundle into a temporary file and return its path
+
+        Ownership of the file passes to the caller, who must delete it (e.g.
+        in a background task once a FileResponse has been sent). Nothing is
+        left on disk if the build fails.
+        """
+        bundle_data = await self._collect_bundle_data(spec, data_sources)
+        fd, path = tempfile.mkstemp(prefix=f"bundle_{spec.bundle_id}_", suffix=".zip")
+        try:
+            with os.fdopen(fd, "wb", buffering=ZIP_BUFFER_SIZE) as zip_file:
+                await self._create_zip_bundle(spec, bundle_data, output=zip_file)
+        except BaseException:
+            os.unlink(path)
+            raise
+        return path
+
+    async def _serialize_entries(self, bundle_data: Dict[str, Any], compression: str) -> List[CompressedEntry]:
+        """
+        Encode and compress all ZIP entries in parallel, preserving archive order
+
+        Each batch runs on the shared compression pool; only the cheap header
+        framing is left for _write_zip.
+        """
+        sources = list(self._iter_zip_sources(bundle_data))
+        if not sources:
+            return []
+
+        workers = cpu_share()
+        batch_size = -(-len(sources) // workers)
+        batches = [sources[i:i + batch_size] for i in range(0, len(sources), batch_size)]
+
+        loop = asyncio.get_running_loop()
+        encoded = await asyncio.gather(
+            *(loop.run_in_executor(_COMPRESSION_POOL, self._encode_batch, batch, compression) for batch in batches)
         )
+        return [entry for batch in encoded for entry in batch]
+
+    def _encode_batch(self, batch: List[Tuple[str, Callable[[Any], bytes], Any, bool]],
+                      compression: str) -> List[CompressedEntry]:
+        """Encode and compress a slice of ZIP entry sources; reads bundle data without mutating it"""
+        return [
+            (name, *compress_entry(encode(value), compression, compress))
+            for name, encode, value, compress in batch
+        ]
+
+    def _write_zip(self, output: BinaryIO, spec: BundleSpec, entries: List[CompressedEntry],
+                   relationships: List[Relationship]):
+        """Frame pre-compressed entries into a ZIP archive"""
+        with ZipStreamWriter(output, compression=spec.compression) as writer:
+            for name, method, payload, crc, file_size in entries:
+                writer.write_compressed(name, payload, crc, file_size, method)
+            self._write_relationships(writer, relationships)
+
+    def _write_relationships(self, writer: ZipStreamWriter, relationships: List[Relationship]):
+        """Stream relationships as NDJSON, one record per line, without building the whole document"""
+        with writer.open(RELATIONSHIPS_ENTRY, force_zip64=True) as handle:
+            for rel in relationships:
+                handle.write(orjson.dumps(rel, default=str, option=_JSONL_OPTIONS))
+
+    def _iter_zip_sources(self, bundle_data: Dict[str, Any]) -> Iterator[Tuple[str, Callable[[Any], bytes], Any, bool]]:
+        """Yield (archive name, encoder, value, compress) for every bundle entry"""
+        # Add bundle metadata
+        yield "bundle.json", _dumps, bundle_data, True
+
+        # Add README
+        yield "README.md", self._encode_readme, bundle_data, True
+
+        # Add documents
+        for doc in bundle_data.get("documents", []):
+            doc_dir = f"documents/{doc['id']}"
+            yield f"{doc_dir}/metadata.json", self._entry_cache.encode, doc, True
+
+            # Add chunks if available
+            for chunk in doc.get("chunks", []):
+                yield f"{doc_dir}/chunks/{chunk.get('id', 'chunk')}.json", self._entry_cache.encode, chunk, True
+
+        # Add datasets
+        for dataset in bundle_data.get("datasets", []):
+            dataset_dir = f"datasets/{dataset['id']}"
+            yield f"{dataset_dir}/metadata.json", _dumps, dataset, True
+
+            # Add raw data if available
+            if "data" in dataset:
+                # Parquet is already zstd-compressed, so store it without DEFLATE
+                yield f"{dataset_dir}/data.parquet", self._dataset_to_parquet, dataset["data"], False
+
+        # Add experiments
+        for exp in bundle_data.get("experiments", []):
+            yield f"experiments/{exp['id']}.json", _dumps, exp, True
+
+        # Add answers
+        for answer in bundle_data.get("answers", []):
+            yield f"answers/{answer['id']}.json", _dumps, answer, True
+
+        # Add plots
+        for plot in bundle_data.get("plots", []):
+            plot_dir = f"plots/{plot['id']}"
+            yield f"{plot_dir}/metadata.json", _dumps, plot, True
+
+            # Add Python code
+            if plot.get("python_code"):
+                yield f"{plot_dir}/plot_code.py", _encode_text, plot["python_code"], True
     
     async def _create_pdf_bundle(self, spec: BundleSpec, bundle_data: Dict[str, Any]) -> BundleResult:
         """Create PDF bundle (placeholder implementation)"""
         # TODO: Implement PDF generation using a library like reportlab or weasyprint
         self.logger.warning("PDF bundle generation not yet implemented")
         
-        return BundleResult(
-            bundle_id=spec.bundle_id,
-            spec=spec,
-            error="PDF bundle generation not yet implemented"
-        )
+        return BundleResult.for_spec(spec, error="PDF bundle generation not yet implemented")
     
     async def _create_html_bundle(self, spec: BundleSpec, bundle_data: Dict[str, Any]) -> BundleResult:
         """Create HTML bundle"""
-        html_content = self._generate_html_report(bundle_data)
+        if self._component_count(bundle_data) > LARGE_BUNDLE_COMPONENTS:
+            async with self._build_limiter:
+                html_content = await asyncio.to_thread(self._generate_html_report, bundle_data)
+        else:
+            html_content = self._generate_html_report(bundle_data)
         
-        return BundleResult(
-            bundle_id=spec.bundle_id,
-            spec=spec,
-            html_data=html_content
+        return BundleResult.for_spec(spec, html_data=html_content)
+    
+    def _encode_readme(self, bundle_data: Dict[str, Any]) -> bytes:
+        """Render the bundle README as UTF-8 bytes"""
+        return _encode_text(self._generate_readme(bundle_data))
+    
+    def _dataset_to_parquet(self, data: Any) -> bytes:
+        """Encode raw dataset rows as zstd-compressed Parquet"""
+        table = self._dataset_to_table(data)
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer, compression="zstd", compression_level=3)
+        return buffer.getvalue()
+    
+    def _dataset_to_table(self, data: Any) -> pa.Table:
+        """
+        Arrow table for raw dataset rows: a dict of columns, a list of
+        records, or anything else pandas.DataFrame accepts (e.g. row lists)
+        """
+        # Built straight from Python objects so the common case never loads pandas
+        try:
+            if isinstance(data, dict):
+                return pa.Table.from_pydict(data)
+            if all(isinstance(row, dict) for row in data):
+                return pa.Table.from_pylist(data)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            self.logger.warning("Dataset needs type coercion for Parquet", error=str(e))
+        
+        import pandas as pd
+        
+        frame = pd.DataFrame(data)
+        frame.columns = [str(column) for column in frame.columns]
+        for column in frame.columns:
+            try:
+                pa.array(frame[column], from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                # Mixed-type column: store its values as text, keeping nulls
+                frame[column] = frame[column].map(str, na_action="ignore")
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    
+    def _component_count(self, bundle_data: Dict[str, Any]) -> int:
+        """Count the entities and relationships rendered into a bundle"""
+        return sum(
+            len(bundle_data.get(key, []))
+            for key in ("documents", "datasets", "experiments", "answers", "plots", "relationships")
         )
     
     def _generate_readme(self, bundle_data: Dict[str, Any]) -> str:
         """Generate README content for the bundle"""
-        lines = [
-            f"# {bundle_data['title']}",
-            "",
-            bundle_data.get("description", "AI Scientist Lab Notebook Bundle"),
-            "",
-            f"**Bundle ID:** {bundle_data['bundle_id']}",
-            f"**Created:** {bundle_data['created_at']}",
-            f"**Workspace:** {bundle_data['workspace_id']}",
-            "",
-            "## Contents",
-            ""
-        ]
-        
-        # Document count
-        doc_count = len(bundle_data.get("documents", []))
-        lines.append(f"- **Documents:** {doc_count}")
-        
-        # Dataset count
-        dataset_count = len(bundle_data.get("datasets", []))
-        lines.append(f"- **Datasets:** {dataset_count}")
-        
-        # Experiment count
-        exp_count = len(bundle_data.get("experiments", []))
-        lines.append(f"- **Experiments:** {exp_count}")
-        
-        # Answer count
-        answer_count = len(bundle_data.get("answers", []))
-        lines.append(f"- **Q&A Sessions:** {answer_count}")
-        
-        # Plot count
-        plot_count = len(bundle_data.get("plots", []))
-        lines.append(f"- **Plots:** {plot_count}")
-        
-        lines.extend([
-            "",
-            "## Structure",
-            "",
-            "This bundle contains the following directories:",
-            "",
-            "- `documents/` - Document metadata and chunks",
-            "- `datasets/` - Dataset metadata and raw data",
-            "- `experiments/` - Experiment summaries",
-            "- `answers/` - Q&A sessions with citations",
-            "- `plots/` - Plot specifications and code",
-            "- `relationships.json` - Relationships between components",
-            "",
-            "## Usage",
-            "",
-            "1. Extract the ZIP file",
-            "2. Open `bundle.json` for an overview",
-            "3. Navigate to specific directories for detailed data",
-            "4. Use the Python code in `plots/` to recreate visualizations",
-            "",
-            "## Relationships",
-            "",
-            "The `relationships.json` file contains connections between:",
-            "- Documents and their chunks",
-            "- Answers and their citations",
-            "- Experiments and source documents",
-            "- Plots and their datasets"
-        ])
-        
-        return "\n".join(lines)
+        return _README_TEMPLATE.format(
+            title=bundle_data["title"],
+            description=bundle_data.get("description") or DEFAULT_DESCRIPTION,
+            bundle_id=bundle_data["bundle_id"],
+            created_at=bundle_data["created_at"],
+            workspace_id=bundle_data["workspace_id"],
+            doc_count=len(bundle_data.get("documents", [])),
+            dataset_count=len(bundle_data.get("datasets", [])),
+            exp_count=len(bundle_data.get("experiments", [])),
+            answer_count=len(bundle_data.get("answers", [])),
+            plot_count=len(bundle_data.get("plots", []))
+        )
     
     def _generate_html_report(self, bundle_data: Dict[str, Any]) -> str:
         """Generate HTML report for the bundle"""
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{bundle_data['title']}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-        .header {{ border-bottom: 2px solid #333; padding-bottom: 20px; margin-bottom: 30px; }}
-        .section {{ margin-bottom: 30px; }}
-        .section h2 {{ color: #2c3e50; border-left: 4px solid #3498db; padding-left: 15px; }}
-        .item {{ background: #f8f9fa; padding: 15px; margin: 10px 0; border-radius: 5px; }}
-        .item h3 {{ margin-top: 0; color: #34495e; }}
-        .metadata {{ font-size: 0.9em; color: #7f8c8d; }}
-        .relationships {{ background: #ecf0f1; padding: 15px; border-radius: 5px; }}
-        .relationship {{ margin: 5px 0; padding: 5px; background: white; border-radius: 3px; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{bundle_data['title']}</h1>
-        <p>{bundle_data.get('description', 'AI Scientist Lab Notebook Bundle')}</p>
-        <div class="metadata">
-            <strong>Bundle ID:</strong> {bundle_data['bundle_id']}<br>
-            <strong>Created:</strong> {bundle_data['created_at']}<br>
-            <strong>Workspace:</strong> {bundle_data['workspace_id']}
-        </div>
-    </div>
-"""
-        
-        # Documents section
-        if bundle_data.get("documents"):
-            html += """
-    <div class="section">
-        <h2>Documents</h2>
-"""
-            for doc in bundle_data["documents"]:
-                html += f"""
-        <div class="item">
-            <h3>{doc.get('title', 'Untitled')}</h3>
-            <p><strong>Filename:</strong> {doc.get('filename', 'N/A')}</p>
-            <p><strong>Chunks:</strong> {len(doc.get('chunks', []))}</p>
-        </div>
-"""
-            html += "    </div>"
-        
-        # Datasets section
-        if bundle_data.get("datasets"):
-            html += """
-    <div class="section">
-        <h2>Datasets</h2>
-"""
-            for dataset in bundle_data["datasets"]:
-                html += f"""
-        <div class="item">
-            <h3>{dataset.get('name', 'Untitled')}</h3>
-            <p>{dataset.get('description', 'No description')}</p>
-            <p><strong>Rows:</strong> {dataset.get('row_count', 'N/A')}</p>
-        </div>
-"""
-            html += "    </div>"
-        
-        # Experiments section
-        if bundle_data.get("experiments"):
-            html += """
-    <div class="section">
-        <h2>Experiments</h2>
-"""
-            for exp in bundle_data["experiments"]:
-                html += f"""
-        <div class="item">
-            <h3>{exp.get('title', 'Untitled')}</h3>
-            <p><strong>Objective:</strong> {exp.get('objective', 'N/A')}</p>
-            <p><strong>Confidence:</strong> {exp.get('confidence_score', 'N/A')}</p>
-        </div>
-"""
-            html += "    </div>"
-        
-        # Answers section
-        if bundle_data.get("answers"):
-            html += """
-    <div class="section">
-        <h2>Q&A Sessions</h2>
-"""
-            for answer in bundle_data["answers"]:
-                html += f"""
-        <div class="item">
-            <h3>Q: {answer.get('question', 'N/A')}</h3>
-            <p><strong>A:</strong> {answer.get('answer', 'N/A')}</p>
-            <p><strong>Confidence:</strong> {answer.get('confidence', 'N/A')}</p>
-            <p><strong>Citations:</strong> {len(answer.get('citations', []))}</p>
-        </div>
-"""
-            html += "    </div>"
-        
-        # Plots section
-        if bundle_data.get("plots"):
-            html += """
-    <div class="section">
-        <h2>Plots</h2>
-"""
-            for plot in bundle_data["plots"]:
-                html += f"""
-        <div class="item">
-            <h3>{plot.get('title', 'Untitled')}</h3>
-            <p><strong>Type:</strong> {plot.get('plot_type', 'N/A')}</p>
-            <p><strong>Data Source:</strong> {plot.get('spec', {}).get('data_source', 'N/A')}</p>
-        </div>
-"""
-            html += "    </div>"
-        
-        # Relationships section
-        if bundle_data.get("relationships"):
-            html += """
-    <div class="section">
-        <h2>Relationships</h2>
-        <div class="relationships">
-"""
-            for rel in bundle_data["relationships"]:
-                html += f"""
-            <div class="relationship">
-                <strong>{rel['type']}:</strong> {rel['source']} → {rel['target']}
-            </div>
-"""
-            html += """
-        </div>
-    </div>
-"""
-        
-        html += """
-</body>
-</html>
-"""
-        
-        return html
+        return _REPORT_TEMPLATE.render(bundle=bundle_data, default_description=DEFAULT_DESCRIPTION)
     
     async def create_notebook_export(self, workspace_id: str, format: str = "json") -> BundleResult:
         """
@@ -583,7 +747,7 @@ class BundleWorker:
         # This would typically fetch all data for the workspace
         # For now, return a placeholder
         spec = BundleSpec(
-            bundle_id=f"notebook_{workspace_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}",
+            bundle_id=f"notebook_{workspace_id}_{_now().strftime('%Y%m%d_%H%M%S')}",
             title=f"Notebook Export - Workspace {workspace_id}",
             description="Complete workspace export",
             workspace_id=workspace_id,
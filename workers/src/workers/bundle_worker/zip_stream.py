@@ -0,0 +1,307 @@
+"""
+Streaming ZIP writer for bundle exports
+
+Writes archives entry by entry to any binary sink (file, socket, multipart
+upload) without seeking, compressing with ISA-L's DEFLATE when available.
+"""
+
+import struct
+import time
+from typing import Any, List, Optional, Tuple
+
+try:
+    from isal import isal_zlib as zlib
+except ImportError:  # pragma: no cover - ISA-L is optional at runtime
+    import zlib
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+ZIP_ZSTANDARD = 93  # APPNOTE 6.3.7
+
+COMPRESSION_METHODS = {
+    "stored": ZIP_STORED,
+    "deflate": ZIP_DEFLATED,
+    "zstd": ZIP_ZSTANDARD,
+}
+
+_ZIP64_LIMIT = 0xFFFFFFFF
+_ZIP64_COUNT_LIMIT = 0xFFFF
+_FLAG_DATA_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_EXTERNAL_ATTR = 0o100644 << 16
+
+
+def _version_needed(method: int, zip64: bool) -> int:
+    """Minimum APPNOTE version required to extract an entry"""
+    if method == ZIP_ZSTANDARD:
+        return 63
+    if zip64:
+        return 45
+    return 20
+
+
+def _dos_datetime(timestamp: float) -> Tuple[int, int]:
+    """Convert a POSIX timestamp to the (time, date) pair used in ZIP headers"""
+    t = time.localtime(timestamp)
+    year = max(t.tm_year, 1980)
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _compressor(method: int, level: int) -> Any:
+    """Create a streaming compressor exposing compress()/flush()"""
+    if method == ZIP_DEFLATED:
+        return zlib.compressobj(level, zlib.DEFLATED, -15)
+    if method == ZIP_ZSTANDARD:
+        import zstandard
+        return zstandard.ZstdCompressor(level=level, threads=-1).compressobj()
+    return None
+
+
+def default_level(compression: str) -> int:
+    """Default compression level per method"""
+    # Level 1 DEFLATE with ISA-L is close to zlib level 6 in ratio
+    return 3 if compression == "zstd" else 1
+
+
+def compress_entry(data: bytes, compression: str = "deflate", compress: bool = True,
+                   level: Optional[int] = None) -> Tuple[int, bytes, int, int]:
+    """
+    Compress an entry payload ahead of framing
+
+    Safe to call from worker threads or processes; zlib, ISA-L and zstd
+    release the GIL while compressing.
+
+    Returns:
+        (method, payload, crc32, uncompressed size) for write_compressed()
+    """
+    method = COMPRESSION_METHODS[compression] if compress else ZIP_STORED
+    compressor = _compressor(method, level if level is not None else default_level(compression))
+    payload = compressor.compress(data) + compressor.flush() if compressor else data
+    return method, payload, zlib.crc32(data), len(data)
+
+
+class _Entry:
+    """Central directory record for a written entry"""
+    __slots__ = ("name", "method", "flags", "crc", "compressed_size",
+                 "file_size", "offset", "zip64")
+
+    def __init__(self, name: bytes, method: int, flags: int, offset: int, zip64: bool):
+        self.name = name
+        self.method = method
+        self.flags = flags
+        self.offset = offset
+        self.zip64 = zip64
+        self.crc = 0
+        self.compressed_size = 0
+        self.file_size = 0
+
+
+class ZipEntryStream:
+    """Writable handle for a single archive entry of unknown size"""
+
+    def __init__(self, writer: "ZipStreamWriter", entry: _Entry, level: int):
+        self._writer = writer
+        self._entry = entry
+        self._compressor = _compressor(entry.method, level)
+        self._closed = False
+
+    def write(self, data: bytes) -> int:
+        if not data:
+            return 0
+        entry = self._entry
+        entry.crc = zlib.crc32(data, entry.crc)
+        entry.file_size += len(data)
+        chunk = self._compressor.compress(data) if self._compressor else data
+        if chunk:
+            entry.compressed_size += len(chunk)
+            self._writer._write(chunk)
+        return len(data)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._compressor:
+            tail = self._compressor.flush()
+            if tail:
+                self._entry.compressed_size += len(tail)
+                self._writer._write(tail)
+        self._writer._finish_stream(self._entry)
+
+    def __enter__(self) -> "ZipEntryStream":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ZipStreamWriter:
+    """
+    Forward-only ZIP writer
+
+    Unlike zipfile.ZipFile, the sink only needs a write() method: offsets
+    are tracked locally so archives can be streamed to non-seekable targets.
+    ZIP64 records are emitted automatically once sizes or offsets exceed
+    the classic 4GB/65535-entry limits.
+    """
+
+    def __init__(self, sink: Any, compression: str = "deflate", level: Optional[int] = None):
+        if compression not in COMPRESSION_METHODS:
+            raise ValueError(f"Unsupported ZIP compression: {compression}")
+        self._sink = sink
+        self._compression = compression
+        self._method = COMPRESSION_METHODS[compression]
+        self._level = level if level is not None else default_level(compression)
+        self._offset = 0
+        self._entries: List[_Entry] = []
+        self._open_stream: Optional[ZipEntryStream] = None
+        self._closed = False
+        self._dos_time, self._dos_date = _dos_datetime(time.time())
+
+    def _write(self, data: bytes):
+        self._sink.write(data)
+        self._offset += len(data)
+
+    def _method_for(self, compress: bool) -> int:
+        return self._method if compress else ZIP_STORED
+
+    def _local_header(self, entry: _Entry, crc: int, compressed_size: int, file_size: int) -> bytes:
+        extra = b""
+        if entry.zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, file_size, compressed_size)
+            compressed_size = file_size = _ZIP64_LIMIT
+        header = struct.pack(
+            "<IHHHHHIIIHH",
+            0x04034B50,
+            _version_needed(entry.method, entry.zip64),
+            entry.flags,
+            entry.method,
+            self._dos_time,
+            self._dos_date,
+            crc,
+            compressed_size,
+            file_size,
+            len(entry.name),
+            len(extra),
+        )
+        return header + entry.name + extra
+
+    def _check_writable(self):
+        if self._closed:
+            raise ValueError("ZIP archive is already closed")
+        if self._open_stream is not None:
+            raise ValueError("Close the open entry stream before writing another entry")
+
+    def write(self, name: str, data: bytes, compress: bool = True):
+        """Write a complete entry whose payload is already in memory"""
+        self._check_writable()
+        method, payload, crc, file_size = compress_entry(data, self._compression, compress, self._level)
+        self.write_compressed(name, payload, crc, file_size, method)
+
+    def write_compressed(self, name: str, payload: bytes, crc: int, file_size: int, method: int):
+        """Write an entry whose payload was compressed ahead of time"""
+        self._check_writable()
+        zip64 = (file_size >= _ZIP64_LIMIT or len(payload) >= _ZIP64_LIMIT)
+        entry = _Entry(name.encode("utf-8"), method, _FLAG_UTF8, self._offset, zip64)
+        entry.crc = crc
+        entry.compressed_size = len(payload)
+        entry.file_size = file_size
+        self._write(self._local_header(entry, crc, entry.compressed_size, file_size))
+        self._write(payload)
+        self._entries.append(entry)
+
+    def open(self, name: str, compress: bool = True, force_zip64: bool = False) -> ZipEntryStream:
+        """Open an entry for incremental writes; sizes go in a data descriptor"""
+        self._check_writable()
+        method = self._method_for(compress)
+        entry = _Entry(name.encode("utf-8"), method, _FLAG_UTF8 | _FLAG_DATA_DESCRIPTOR,
+                       self._offset, force_zip64)
+        self._write(self._local_header(entry, 0, 0, 0))
+        self._open_stream = ZipEntryStream(self, entry, self._level)
+        return self._open_stream
+
+    def _finish_stream(self, entry: _Entry):
+        if not entry.zip64 and (entry.file_size >= _ZIP64_LIMIT or entry.compressed_size >= _ZIP64_LIMIT):
+            raise ValueError("Entry exceeded 4GB; reopen it with force_zip64=True")
+        if entry.zip64:
+            descriptor = struct.pack("<IIQQ", 0x08074B50, entry.crc,
+                                     entry.compressed_size, entry.file_size)
+        else:
+            descriptor = struct.pack("<IIII", 0x08074B50, entry.crc,
+                                     entry.compressed_size, entry.file_size)
+        self._write(descriptor)
+        self._entries.append(entry)
+        self._open_stream = None
+
+    def _central_record(self, entry: _Entry) -> bytes:
+        zip64_fields = []
+        file_size, compressed_size, offset = entry.file_size, entry.compressed_size, entry.offset
+        if entry.zip64 or file_size >= _ZIP64_LIMIT:
+            zip64_fields.append(file_size)
+            file_size = _ZIP64_LIMIT
+        if entry.zip64 or compressed_size >= _ZIP64_LIMIT:
+            zip64_fields.append(compressed_size)
+            compressed_size = _ZIP64_LIMIT
+        if offset >= _ZIP64_LIMIT:
+            zip64_fields.append(offset)
+            offset = _ZIP64_LIMIT
+
+        extra = b""
+        if zip64_fields:
+            extra = struct.pack(f"<HH{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields)
+        version = _version_needed(entry.method, bool(zip64_fields))
+        header = struct.pack(
+            "<IHHHHHHIIIHHHHHII",
+            0x02014B50,
+            (3 << 8) | version,
+            version,
+            entry.flags,
+            entry.method,
+            self._dos_time,
+            self._dos_date,
+            entry.crc,
+            compressed_size,
+            file_size,
+            len(entry.name),
+            len(extra),
+            0,
+            0,
+            0,
+            _EXTERNAL_ATTR,
+            offset,
+        )
+        return header + entry.name + extra
+
+    def close(self):
+        """Write the central directory and end-of-archive records"""
+        if self._closed:
+            return
+        if self._open_stream is not None:
+            self._open_stream.close()
+
+        cd_offset = self._offset
+        for entry in self._entries:
+            self._write(self._central_record(entry))
+        cd_size = self._offset - cd_offset
+        count = len(self._entries)
+
+        if count >= _ZIP64_COUNT_LIMIT or cd_offset >= _ZIP64_LIMIT or cd_size >= _ZIP64_LIMIT:
+            zip64_eocd_offset = self._offset
+            self._write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, (3 << 8) | 45, 45,
+                                    0, 0, count, count, cd_size, cd_offset))
+            self._write(struct.pack("<IIQI", 0x07064B50, 0, zip64_eocd_offset, 1))
+            count = min(count, _ZIP64_COUNT_LIMIT)
+            cd_size = min(cd_size, _ZIP64_LIMIT)
+            cd_offset = min(cd_offset, _ZIP64_LIMIT)
+
+        self._write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0))
+        self._closed = True
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
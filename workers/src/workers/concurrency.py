@@ -0,0 +1,17 @@
+"""
+CPU budget shared by the worker pools of one server process
+"""
+
+import os
+
+
+def cpu_share() -> int:
+    """
+    Cores available to pools in this process
+
+    uvicorn runs WEB_CONCURRENCY server processes side by side, each with its
+    own pools, so every process gets its share of the cores rather than all
+    of them (which would run cores x processes CPU-bound workers).
+    """
+    processes = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+    return max(1, (os.cpu_count() or 1) // processes)
@@ -4,17 +4,51 @@ Handles text and table embeddings with batching and backpressure
 """
 
 import asyncio
+import gc
 import logging
-from typing import Dict, List, Any, Optional
+import os
+from typing import Dict, List, Any, Optional, Tuple
 import structlog
 from sentence_transformers import SentenceTransformer
 import numpy as np
 import pandas as pd
+import torch
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 import time
 
+from ..concurrency import cpu_share
+
 logger = structlog.get_logger(__name__)
 
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# Inference backend: "onnx" (default), "openvino" on Intel hosts, or "torch"
+EMBED_BACKEND = os.getenv('EMBED_BACKEND', 'onnx')
+
+# Pre-quantized int8 weights shipped with the model repo for each backend
+_BACKEND_MODEL_FILES = {
+    'onnx': 'onnx/model_qint8_avx512_vnni.onnx',
+    'openvino': 'openvino/openvino_model_qint8_quantized.xml',
+}
+
+# The int8 VNNI kernels are CPU-only; accelerator providers run the FP32 export
+_ONNX_ACCELERATOR_MODEL_FILE = 'onnx/model.onnx'
+
+# Process-wide model so concurrent workers share one set of weights
+_MODEL: Optional[SentenceTransformer] = None
+_MODEL_LOCK = asyncio.Lock()
+
+# Single encoder thread: the model parallelizes internally across cores
+_ENCODE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed-encode")
+
+# Offload the model from GPU after this long without requests
+IDLE_UNLOAD_SECONDS = 60
+
+# Precision of embeddings attached to chunks/tables: "float32" (default), "float16" or "int8"
+EMBED_PRECISION = os.getenv('EMBED_PRECISION', 'float32')
+
 
 @dataclass
 class EmbeddingRequest:
@@ -29,13 +63,20 @@ class EmbeddingRequest:
 class EmbedWorker:
     """Embedding processing worker for text and table data"""
     
-    def __init__(self, batch_size: int = 32, max_queue_size: int = 1000):
+    def __init__(self, batch_size: Optional[int] = None, max_queue_size: int = 1000,
+                 embedding_precision: str = EMBED_PRECISION, max_batch_tokens: int = 4096):
         self.logger = logger.bind(worker="embed_worker")
-        self.batch_size = batch_size
+        # Default to one item per core in this process's share (see cpu_share)
+        self.batch_size = batch_size or max(8, cpu_share())
+        self.embedding_precision = embedding_precision
+        # Queue batches are packed to a token budget rather than a fixed count
+        self.max_batch_tokens = max_batch_tokens
         self.max_queue_size = max_queue_size
         self.embedding_model = None
         self.request_queue = asyncio.Queue(maxsize=max_queue_size)
         self.processing = False
+        self._carry_over: Optional[EmbeddingRequest] = None
+        self._last_request_ts = time.time()
         
     async def start(self):
         """Start the embedding worker"""
@@ -105,10 +146,10 @@ class EmbedWorker:
             
             # Process embeddings
             embeddings = await self._process_embeddings(requests)
+            stored, scales = self._quantize_for_storage(embeddings)
             
             # Attach embeddings to chunks
-            for chunk, embedding in zip(chunks, embeddings):
-                chunk['embedding'] = embedding.tolist()
+            self._attach_embeddings(chunks, stored, scales, 'embedding')
             
             self.logger.info("Chunk embedding completed", 
                            document_id=chunks_data.get('document_id'),
@@ -144,44 +185,36 @@ class EmbedWorker:
             # Create embedding requests for table schemas and content
             requests = []
             for table in tables:
+                metadata = {
+                    'document_id': tables_data.get('document_id'),
+                    'table_id': table.get('id'),
+                    'page': table.get('page')
+                }
                 # Embed table schema
-                schema_text = self._table_schema_to_text(table.get('schema', {}))
-                schema_request = EmbeddingRequest(
+                requests.append(EmbeddingRequest(
                     id=f"{table.get('id', 'table')}_schema",
-                    text=schema_text,
+                    text=self._table_schema_to_text(table.get('schema', {})),
                     type='table_schema',
-                    metadata={
-                        'document_id': tables_data.get('document_id'),
-                        'table_id': table.get('id'),
-                        'page': table.get('page')
-                    }
-                )
-                requests.append(schema_request)
-                
+                    metadata=metadata
+                ))
                 # Embed table content (first few rows)
-                content_text = self._table_content_to_text(table.get('data', []))
-                content_request = EmbeddingRequest(
+                requests.append(EmbeddingRequest(
                     id=f"{table.get('id', 'table')}_content",
-                    text=content_text,
+                    text=self._table_content_to_text(table.get('data', [])),
                     type='table_content',
-                    metadata={
-                        'document_id': tables_data.get('document_id'),
-                        'table_id': table.get('id'),
-                        'page': table.get('page')
-                    }
-                )
-                requests.append(content_request)
+                    metadata=metadata
+                ))
             
-            # Process embeddings
+            # Process embeddings; schema and content rows alternate
             embeddings = await self._process_embeddings(requests)
+            stored, scales = self._quantize_for_storage(embeddings)
             
             # Attach embeddings to tables
-            for i, table in enumerate(tables):
-                schema_emb_idx = i * 2
-                content_emb_idx = i * 2 + 1
-                
-                table['schema_embedding'] = embeddings[schema_emb_idx].tolist()
-                table['content_embedding'] = embeddings[content_emb_idx].tolist()
+            schema_scales = content_scales = None
+            if scales is not None:
+                schema_scales, content_scales = scales[0::2], scales[1::2]
+            self._attach_embeddings(tables, stored[0::2], schema_scales, 'schema_embedding')
+            self._attach_embeddings(tables, stored[1::2], content_scales, 'content_embedding')
             
             self.logger.info("Table embedding completed", 
                            document_id=tables_data.get('document_id'),
@@ -203,24 +236,36 @@ class EmbedWorker:
                 batch = []
                 batch_start_time = time.time()
                 
-                # Wait for first request
-                try:
-                    first_request = await asyncio.wait_for(
-                        self.request_queue.get(), timeout=1.0
-                    )
-                    batch.append(first_request)
-                except asyncio.TimeoutError:
-                    continue
+                # Wait for first request (or the one that overflowed the last batch)
+                if self._carry_over is not None:
+                    first_request, self._carry_over = self._carry_over, None
+                else:
+                    try:
+                        first_request = await asyncio.wait_for(
+                            self.request_queue.get(), timeout=1.0
+                        )
+                    except asyncio.TimeoutError:
+                        if time.time() - self._last_request_ts > IDLE_UNLOAD_SECONDS:
+                            await self.unload()
+                        continue
+                batch.append(first_request)
+                batch_tokens = self._estimate_tokens(first_request.text)
                 
-                # Collect more requests for batch
-                while len(batch) < self.batch_size:
+                # Collect more requests until the token budget is spent
+                while True:
                     try:
                         request = await asyncio.wait_for(
                             self.request_queue.get(), timeout=0.1
                         )
-                        batch.append(request)
                     except asyncio.TimeoutError:
                         break
+                    
+                    request_tokens = self._estimate_tokens(request.text)
+                    if batch_tokens + request_tokens > self.max_batch_tokens:
+                        self._carry_over = request
+                        break
+                    batch.append(request)
+                    batch_tokens += request_tokens
                 
                 # Process batch
                 if batch:
@@ -229,12 +274,17 @@ class EmbedWorker:
                     batch_time = time.time() - batch_start_time
                     self.logger.debug("Batch processed", 
                                     batch_size=len(batch),
+                                    batch_tokens=batch_tokens,
                                     processing_time=batch_time)
                 
             except Exception as e:
                 self.logger.error("Error in processing loop", error=str(e))
                 await asyncio.sleep(1)  # Back off on error
     
+    def _estimate_tokens(self, text: str) -> int:
+        """Rough token count (~4 characters per token) for batch packing"""
+        return len(text) // 4 + 1
+    
     async def _process_batch(self, batch: List[EmbeddingRequest]):
         """Process a batch of embedding requests"""
         try:
@@ -254,61 +304,178 @@ class EmbedWorker:
             self.logger.error("Batch processing failed", error=str(e))
             raise
     
-    async def _process_embeddings(self, requests: List[EmbeddingRequest]) -> List[np.ndarray]:
+    async def _process_embeddings(self, requests: List[EmbeddingRequest]) -> np.ndarray:
         """Process embeddings for a list of requests"""
         try:
-            texts = [req.text for req in requests]
-            embeddings = await self._get_embeddings(texts)
-            return embeddings
+            # Encode each distinct text once (repeated headers, short schemas)
+            unique_index: Dict[str, int] = {}
+            positions = [unique_index.setdefault(req.text, len(unique_index)) for req in requests]
+            
+            embeddings = await self._get_embeddings(list(unique_index))
+            if len(unique_index) == len(requests):
+                return embeddings
+            return embeddings[positions]
             
         except Exception as e:
             self.logger.error("Embedding processing failed", error=str(e))
             raise
     
     async def _load_embedding_model(self):
-        """Load the embedding model"""
+        """Load the embedding model, shared by every EmbedWorker in the process"""
+        global _MODEL
+        
         if self.embedding_model is None:
-            try:
-                # TODO: Use a more appropriate model for scientific text
-                self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-                self.logger.info("Embedding model loaded successfully")
-            except Exception as e:
-                self.logger.error("Failed to load embedding model", error=str(e))
-                raise
+            async with _MODEL_LOCK:
+                if _MODEL is None:
+                    try:
+                        # TODO: Use a more appropriate model for scientific text
+                        _MODEL = await asyncio.to_thread(
+                            SentenceTransformer,
+                            EMBEDDING_MODEL_NAME,
+                            backend=EMBED_BACKEND,
+                            model_kwargs=self._backend_model_kwargs(EMBED_BACKEND)
+                        )
+                        if EMBED_BACKEND == 'torch':
+                            torch.set_num_threads(cpu_share())
+                            _MODEL.eval()
+                            if torch.cuda.is_available():
+                                _MODEL.half()
+                        self.logger.info("Embedding model loaded successfully", backend=EMBED_BACKEND)
+                    except Exception as e:
+                        self.logger.error("Failed to load embedding model", error=str(e))
+                        raise
+            self.embedding_model = _MODEL
+    
+    def _backend_model_kwargs(self, backend: str) -> Dict[str, Any]:
+        """Model loading options for the selected inference backend"""
+        if backend not in _BACKEND_MODEL_FILES:
+            return {}
+        
+        model_kwargs: Dict[str, Any] = {'file_name': _BACKEND_MODEL_FILES[backend]}
+        if backend == 'onnx':
+            import onnxruntime as ort
+            
+            # Providers are listed in priority order, e.g. TensorRT, CUDA, CPU
+            provider = ort.get_available_providers()[0]
+            if provider != 'CPUExecutionProvider':
+                model_kwargs['file_name'] = _ONNX_ACCELERATOR_MODEL_FILE
+            
+            session_options = ort.SessionOptions()
+            session_options.intra_op_num_threads = cpu_share()
+            model_kwargs['provider'] = provider
+            model_kwargs['session_options'] = session_options
+        
+        return model_kwargs
     
-    async def _get_embeddings(self, texts: List[str]) -> List[np.ndarray]:
-        """Get embeddings for a list of texts"""
+    async def _get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for a list of texts as a contiguous (N, D) float32 matrix"""
         await self._load_embedding_model()
+        self._last_request_ts = time.time()
         
         try:
-            # Batch encode texts
-            embeddings = self.embedding_model.encode(texts, convert_to_tensor=True)
+            # encode() already batches in length order and returns rows in input order
+            encode = partial(
+                self._encode,
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,  # unit vectors: cosine similarity is a dot product
+                show_progress_bar=False
+            )
+            # encode() blocks; run it off the event loop on the encoder thread
+            loop = asyncio.get_running_loop()
+            if self._offloaded_from_gpu():
+                await loop.run_in_executor(_ENCODE_POOL, self._move_model, 'cuda')
+            embeddings = await loop.run_in_executor(_ENCODE_POOL, encode)
             
-            # Convert to numpy arrays
-            embeddings_np = embeddings.cpu().numpy()
-            
-            return [emb for emb in embeddings_np]
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
             
         except Exception as e:
             self.logger.error("Failed to generate embeddings", error=str(e))
             raise
     
+    async def unload(self):
+        """
+        Release the model's GPU memory while the worker is idle
+        
+        The weights move to host memory and are moved back on the next
+        encode, leaving VRAM free for layout/OCR stages between bursts.
+        """
+        model = self.embedding_model
+        if model is None or EMBED_BACKEND != 'torch' or model.device.type != 'cuda':
+            return
+        
+        # Runs on the encoder thread so it can never interleave with an encode
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_ENCODE_POOL, self._move_model, 'cpu')
+        self.logger.info("Embedding model offloaded from GPU")
+    
+    def _offloaded_from_gpu(self) -> bool:
+        """Whether the model was moved to host memory by unload()"""
+        return (EMBED_BACKEND == 'torch' and torch.cuda.is_available()
+                and self.embedding_model.device.type == 'cpu')
+    
+    def _move_model(self, device: str):
+        """Move the shared model between devices, freeing cached GPU blocks"""
+        self.embedding_model.to(device)
+        if device == 'cpu':
+            gc.collect()
+            torch.cuda.empty_cache()
+    
+    def _encode(self, texts: List[str], **kwargs: Any) -> np.ndarray:
+        """Run the model without autograd bookkeeping (called on the encoder thread)"""
+        with torch.inference_mode():
+            return self.embedding_model.encode(texts, **kwargs)
+    
+    def _quantize_for_storage(self, embeddings: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Reduce embeddings to the configured storage precision
+        
+        int8 uses a symmetric scale per vector (value = q * scale), so each
+        stored vector stands alone and stays comparable across batches and
+        documents; all-zero vectors get a scale of 1. float16 halves the
+        payload and needs no scale.
+        
+        Returns:
+            Stored embeddings and per-vector scales (None unless int8)
+        """
+        if self.embedding_precision == 'float16':
+            return embeddings.astype(np.float16), None
+        if self.embedding_precision != 'int8' or len(embeddings) == 0:
+            return embeddings, None
+        
+        scales = np.abs(embeddings).max(axis=1) / 127
+        scales[scales == 0] = 1.0
+        quantized = np.rint(embeddings / scales[:, None]).astype(np.int8)
+        return quantized, scales.astype(np.float32)
+    
+    def _attach_embeddings(self, items: List[Dict[str, Any]], stored: np.ndarray,
+                           scales: Optional[np.ndarray], key: str):
+        """
+        Attach stored embeddings to chunk or table records as number lists
+        
+        At the default float32 precision only ``key`` is set, as it always
+        was. Reduced precisions add ``{key}_dtype`` and, for int8, the
+        ``{key}_scale`` that multiplies the stored values back to floats.
+        """
+        reduced = stored.dtype in (np.float16, np.int8)
+        for i, (item, embedding) in enumerate(zip(items, stored)):
+            item[key] = embedding.tolist()
+            if reduced:
+                item[f'{key}_dtype'] = stored.dtype.name
+            if scales is not None:
+                item[f'{key}_scale'] = float(scales[i])
+    
     def _table_schema_to_text(self, schema: Dict[str, Any]) -> str:
         """Convert table schema to text for embedding"""
         if not schema or 'columns' not in schema:
             return ""
         
-        schema_parts = []
-        for col in schema['columns']:
-            col_text = f"Column: {col.get('name', 'unknown')}"
-            col_text += f", Type: {col.get('type', 'unknown')}"
-            
-            if col.get('unit'):
-                col_text += f", Unit: {col['unit']}"
-            
-            schema_parts.append(col_text)
-        
-        return "; ".join(schema_parts)
+        return "; ".join([
+            f"Column: {col.get('name', 'unknown')}, Type: {col.get('type', 'unknown')}"
+            + (f", Unit: {col['unit']}" if col.get('unit') else "")
+            for col in schema['columns']
+        ])
     
     def _table_content_to_text(self, data: List[List[Any]]) -> str:
         """Convert table content to text for embedding"""
@@ -317,11 +484,6 @@ class EmbedWorker:
         
         # Take first few rows for embedding
         max_rows = 5
-        content_rows = data[:max_rows]
-        
-        content_parts = []
-        for row in content_rows:
-            row_text = ", ".join(str(cell) for cell in row)
-            content_parts.append(row_text)
         
-        return "; ".join(content_parts)
+        # map(str, ...) stringifies cells in C without a per-cell generator frame
+        return "; ".join([", ".join(map(str, row)) for row in data[:max_rows]])
@@ -5,15 +5,107 @@ Handles PDF parsing, layout analysis, figure/table detection, and chunking
 
 import asyncio
 import logging
-from typing import Dict, List, Any
+import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 import fitz  # PyMuPDF
 import pdfplumber
+from tokenizers import Encoding, Tokenizer
 from PIL import Image
 import io
 import structlog
 
+from ..concurrency import cpu_share
+
 logger = structlog.get_logger(__name__)
 
+# Paragraph boundaries for chunking
+_PARA_RE = re.compile(r'\n\n+')
+
+# Same tokenizer as EmbedWorker's model, so chunk sizes are exact token counts
+TOKENIZER_NAME = 'sentence-transformers/all-MiniLM-L6-v2'
+
+# The embedding model reads at most 256 tokens, [CLS] and [SEP] included;
+# anything past that in a chunk would never be embedded
+CHUNK_TOKENS = 254
+
+# Below this many pages, process start-up costs more than it saves
+PARALLEL_MIN_PAGES = 8
+
+_PAGE_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _page_pool() -> ProcessPoolExecutor:
+    """Process pool for page-level extraction, created on first use"""
+    global _PAGE_POOL
+    if _PAGE_POOL is None:
+        _PAGE_POOL = ProcessPoolExecutor(max_workers=cpu_share())
+    return _PAGE_POOL
+
+
+@lru_cache(maxsize=1)
+def _tokenizer() -> Tokenizer:
+    """Fast (Rust) tokenizer, loaded once per process"""
+    tokenizer = Tokenizer.from_pretrained(TOKENIZER_NAME)
+    # Count every token of a paragraph: no truncation cap, no padding
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    return tokenizer
+
+
+def _token_pieces(encoding: Encoding, limit: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Split an encoding into runs of at most ``limit`` tokens
+    
+    Yields (start, end, tokens) with character offsets into the encoded text.
+    Cuts fall between words where possible, so WordPiece re-tokenizes each
+    piece to exactly the counted tokens.
+    """
+    offsets, word_ids = encoding.offsets, encoding.word_ids
+    start = 0
+    while start < len(offsets):
+        end = min(start + limit, len(offsets))
+        if end < len(offsets):
+            # Back off to the start of the word the window ends in, unless
+            # that word fills the whole window
+            cut = end
+            while cut > start and word_ids[cut] is not None and word_ids[cut] == word_ids[cut - 1]:
+                cut -= 1
+            if cut > start:
+                end = cut
+        yield offsets[start][0], offsets[end - 1][1], end - start
+        start = end
+
+
+def _split_pages(total_pages: int, parts: int) -> List[range]:
+    """Split 1-based page numbers into at most ``parts`` contiguous ranges"""
+    size = -(-total_pages // parts)
+    return [range(start, min(start + size, total_pages + 1)) for start in range(1, total_pages + 1, size)]
+
+
+@contextmanager
+def open_pdf(pdf_path: str) -> Iterator[fitz.Document]:
+    """
+    Open a PDF by path, closing it on exit
+    
+    MuPDF reads the file itself, on demand, rather than from a copy of the
+    whole file in Python memory.
+    """
+    doc = fitz.open(pdf_path)
+    try:
+        yield doc
+    finally:
+        doc.close()
+
+
+def _extract_tables_range(pdf_path: str, page_range: range) -> List[Dict[str, Any]]:
+    """Pool entry point: each process opens its own handle on the PDF"""
+    with open_pdf(pdf_path) as doc:
+        return PDFWorker()._extract_page_tables(pdf_path, doc, page_range)
+
 
 class PDFWorker:
     """PDF processing worker for document ingestion"""
@@ -40,12 +132,17 @@ class PDFWorker:
             # For now, use a placeholder
             pdf_path = "/tmp/sample.pdf"
             
-            # Parse PDF structure
-            structure = await self.parse_pdf_structure(pdf_path)
+            # Open once; each phase shares the parsed document and xref table
+            with open_pdf(pdf_path) as doc:
+                # Parse PDF structure
+                structure = await self.parse_pdf_structure(doc)
+                
+                # Detect figures and tables
+                figures = await self.detect_figures(doc, structure)
+                tables = await self.extract_tables(pdf_path, doc, structure)
             
-            # Detect figures and tables
-            figures = await self.detect_figures(pdf_path, structure)
-            tables = await self.extract_tables(pdf_path, structure)
+            # Page text is no longer needed once every phase has run
+            structure.pop('page_blocks', None)
             
             # Create text chunks
             chunks = await self.create_chunks(structure)
@@ -76,177 +173,273 @@ class PDFWorker:
                             error=str(e))
             raise
     
-    async def parse_pdf_structure(self, pdf_path: str) -> Dict[str, Any]:
+    async def parse_pdf_structure(self, doc: fitz.Document) -> Dict[str, Any]:
         """Parse PDF structure and extract sections"""
         try:
-            doc = fitz.open(pdf_path)
             structure = {
                 'total_pages': len(doc),
                 'sections': [],
-                'text_by_page': []
+                # Text blocks of pages visited so far, shared with figure captioning
+                'page_blocks': {}
             }
             
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                text = page.get_text()
-                structure['text_by_page'].append({
-                    'page': page_num + 1,
-                    'text': text,
-                    'bbox': page.rect
-                })
-            
+            # Pages are streamed into section detection one at a time, so
+            # each page's text can be released once it has been consumed;
+            # MuPDF text extraction blocks, so it runs off the event loop
             # TODO: Implement section detection (abstract, introduction, methods, etc.)
-            structure['sections'] = self._detect_sections(structure['text_by_page'])
+            structure['sections'] = await asyncio.to_thread(
+                self._detect_sections, self.iter_pages(doc, structure['page_blocks'])
+            )
             
-            doc.close()
             return structure
             
         except Exception as e:
             self.logger.error("PDF structure parsing failed", error=str(e))
             raise
     
-    async def detect_figures(self, pdf_path: str, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def iter_pages(self, doc: fitz.Document,
+                   block_cache: Optional[Dict[int, List[tuple]]] = None) -> Iterator[Tuple[int, str, fitz.Rect]]:
+        """Lazily yield (page number, text, bbox) for each page of an open document"""
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            blocks = self._page_blocks(page, block_cache)
+            # Same text as page.get_text(), rebuilt from the cached blocks
+            text = "".join(block[4] for block in blocks if block[6] == 0)
+            yield page_num + 1, text, page.rect
+    
+    def _page_blocks(self, page: fitz.Page, block_cache: Optional[Dict[int, List[tuple]]] = None) -> List[tuple]:
+        """
+        Text blocks (x0, y0, x1, y1, text, block_no, block_type) of a page
+        
+        MuPDF's text reconstruction is the expensive part of reading a page,
+        so it runs once per page and is shared by sections and captions.
+        """
+        if block_cache is None:
+            return page.get_text('blocks')
+        if page.number not in block_cache:
+            block_cache[page.number] = page.get_text('blocks')
+        return block_cache[page.number]
+    
+    async def detect_figures(self, doc: fitz.Document, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Detect figures in the PDF"""
         figures = []
         
         try:
-            doc = fitz.open(pdf_path)
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Look for image blocks
-                image_blocks = page.get_image_info()
-                
-                for img in image_blocks:
-                    figure = {
-                        'page': page_num + 1,
-                        'bbox': img['bbox'],
-                        'figure_number': self._extract_figure_number(page, img['bbox']),
-                        'caption': self._extract_caption(page, img['bbox']),
-                        's3_key': None  # TODO: Extract and upload figure image
-                    }
-                    figures.append(figure)
-            
-            doc.close()
+            figures = await asyncio.to_thread(self._find_figures, doc, structure.get('page_blocks'))
             
         except Exception as e:
             self.logger.error("Figure detection failed", error=str(e))
         
         return figures
     
-    async def extract_tables(self, pdf_path: str, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Extract tables from the PDF"""
+    def _find_figures(self, doc: fitz.Document,
+                      block_cache: Optional[Dict[int, List[tuple]]] = None) -> List[Dict[str, Any]]:
+        """Figure records for every image on every page (blocking)"""
+        figures = []
+        
+        for page_num in range(len(doc)):
+            page = doc[page_num]
+            
+            # Look for image blocks
+            image_blocks = page.get_image_info()
+            if not image_blocks:
+                continue
+            
+            text_blocks = self._page_blocks(page, block_cache)
+            for img in image_blocks:
+                figure = {
+                    'page': page_num + 1,
+                    'bbox': img['bbox'],
+                    'figure_number': self._extract_figure_number(page, img['bbox']),
+                    'caption': self._extract_caption(text_blocks, img['bbox']),
+                    's3_key': None  # TODO: Extract and upload figure image
+                }
+                figures.append(figure)
+        
+        return figures
+    
+    async def extract_tables(self, pdf_path: str, doc: fitz.Document, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Extract tables from the PDF, fanning page ranges out across processes"""
         tables = []
         
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages):
-                    page_tables = page.extract_tables()
-                    
-                    for table_idx, table in enumerate(page_tables):
-                        if table and len(table) > 1:  # Valid table
-                            table_data = {
-                                'page': page_num + 1,
-                                'table_number': table_idx + 1,
-                                'data': table,
-                                'bbox': page.bbox,
-                                'title': self._extract_table_title(page, table_idx),
-                                'caption': self._extract_table_caption(page, table_idx)
-                            }
-                            tables.append(table_data)
+            total_pages = structure['total_pages']
+            if total_pages < PARALLEL_MIN_PAGES:
+                return await asyncio.to_thread(self._extract_page_tables, pdf_path, doc, range(1, total_pages + 1))
+            
+            loop = asyncio.get_running_loop()
+            ranges = _split_pages(total_pages, cpu_share())
+            results = await asyncio.gather(*(
+                loop.run_in_executor(_page_pool(), _extract_tables_range, pdf_path, page_range)
+                for page_range in ranges
+            ))
+            # Ranges are contiguous and gathered in order, so page order is preserved
+            tables = [table for range_tables in results for table in range_tables]
             
         except Exception as e:
             self.logger.error("Table extraction failed", error=str(e))
         
         return tables
     
+    def _extract_page_tables(self, pdf_path: str, doc: fitz.Document,
+                             page_numbers: Sequence[int]) -> List[Dict[str, Any]]:
+        """
+        Extract tables from the given 1-based pages
+        
+        Uses PyMuPDF's table finder on the already-parsed page layout; pdfplumber
+        is consulted for each page where PyMuPDF finds no tables. The decision
+        is made per page so the result does not depend on how pages were split
+        across workers.
+        """
+        tables_by_page = {}
+        
+        for page_num in page_numbers:
+            page = doc[page_num - 1]
+            page_tables = [table.extract() for table in page.find_tables().tables]
+            tables_by_page[page_num] = self._table_records(page, page_num, tuple(page.rect), page_tables)
+        
+        fallback_pages = [page_num for page_num, records in tables_by_page.items() if not records]
+        if fallback_pages:
+            with pdfplumber.open(pdf_path, pages=fallback_pages) as pdf:
+                for page in pdf.pages:
+                    tables_by_page[page.page_number] = self._table_records(
+                        page, page.page_number, page.bbox, page.extract_tables())
+        
+        # Dicts keep insertion order, so tables stay in page order
+        return [table for records in tables_by_page.values() for table in records]
+    
+    def _table_records(self, page, page_num: int, bbox, page_tables: List[List[List[Any]]]) -> List[Dict[str, Any]]:
+        """Build table records for one page's extracted cell grids"""
+        return [
+            {
+                'page': page_num,
+                'table_number': table_idx + 1,
+                'data': table,
+                'bbox': bbox,
+                'title': self._extract_table_title(page, table_idx),
+                'caption': self._extract_table_caption(page, table_idx)
+            }
+            for table_idx, table in enumerate(page_tables)
+            if table and len(table) > 1  # Valid table
+        ]
+    
     async def create_chunks(self, structure: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Create text chunks for embedding"""
         chunks = []
         
+        # Load outside the guard below: without the tokenizer every document
+        # would silently get zero chunks, so that failure must surface
+        await asyncio.to_thread(_tokenizer)
+        
         try:
-            for section in structure['sections']:
-                # Create chunks within each section
-                section_chunks = self._chunk_text(section['text'], 
-                                                section['name'], 
-                                                section['page_from'], 
-                                                section['page_to'])
-                chunks.extend(section_chunks)
+            # Create chunks within each section; the Rust tokenizer releases
+            # the GIL, so sections are tokenized in parallel threads
+            section_chunks = await asyncio.gather(*(
+                asyncio.to_thread(self._chunk_text,
+                                  section['text'],
+                                  section['name'],
+                                  section['page_from'],
+                                  section['page_to'])
+                for section in structure['sections']
+            ))
+            chunks = [chunk for chunks_in_section in section_chunks for chunk in chunks_in_section]
             
         except Exception as e:
             self.logger.error("Chunk creation failed", error=str(e))
         
         return chunks
     
-    def _detect_sections(self, text_by_page: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Detect document sections"""
+    def _detect_sections(self, pages: Iterable[Tuple[int, str, fitz.Rect]]) -> List[Dict[str, Any]]:
+        """Detect document sections from a stream of pages"""
         # TODO: Implement section detection logic
-        # This is a placeholder implementation
-        sections = [
-            {
-                'name': 'abstract',
-                'page_from': 1,
-                'page_to': 1,
-                'text': text_by_page[0]['text'][:1000] if text_by_page else ''
-            }
-        ]
-        return sections
+        # This is a placeholder implementation: the first page is the abstract,
+        # so later pages are never extracted
+        for page_num, text, _bbox in pages:
+            return [
+                {
+                    'name': 'abstract',
+                    'page_from': page_num,
+                    'page_to': page_num,
+                    'text': text[:1000]
+                }
+            ]
+        
+        return [{'name': 'abstract', 'page_from': 1, 'page_to': 1, 'text': ''}]
     
     def _chunk_text(self, text: str, section: str, page_from: int, page_to: int) -> List[Dict[str, Any]]:
-        """Split text into chunks"""
-        # Simple chunking by sentences/paragraphs
+        """Split text into chunks of up to CHUNK_TOKENS embedding-model tokens"""
+        # Simple chunking by paragraphs: walk paragraph boundaries and slice
+        # each chunk out of the text once, instead of concatenating strings
         # TODO: Implement more sophisticated chunking
-        chunk_size = 800  # target tokens
+        chunk_size = CHUNK_TOKENS
         chunks = []
         
-        # Split by paragraphs first
-        paragraphs = text.split('\n\n')
-        current_chunk = ""
-        current_pages = []
+        spans = []
+        para_start = 0
+        for boundary in chain(_PARA_RE.finditer(text), (None,)):
+            spans.append((para_start, boundary.start() if boundary else len(text)))
+            if boundary:
+                para_start = boundary.end()
+        
+        # Paragraph separators are whitespace and add no tokens
+        encodings = _tokenizer().encode_batch([text[start:end] for start, end in spans], add_special_tokens=False)
         
-        for i, para in enumerate(paragraphs):
-            if len(current_chunk) + len(para) > chunk_size and current_chunk:
-                chunks.append({
-                    'text': current_chunk.strip(),
-                    'section': section,
-                    'page_from': min(current_pages) if current_pages else page_from,
-                    'page_to': max(current_pages) if current_pages else page_to,
-                    'metadata': {
-                        'chunk_type': 'text',
-                        'word_count': len(current_chunk.split())
-                    }
-                })
-                current_chunk = para
-                current_pages = [page_from]  # Simplified
+        # Paragraphs over the window are cut into window-sized pieces by token
+        # offsets, so no chunk outgrows what the embedding model can see
+        pieces = []
+        for (para_start, para_end), encoding in zip(spans, encodings):
+            if len(encoding.ids) <= chunk_size:
+                pieces.append((para_start, para_end, len(encoding.ids)))
             else:
-                current_chunk += "\n\n" + para if current_chunk else para
-                current_pages.append(page_from)  # Simplified
+                pieces.extend((para_start + start, para_start + end, tokens)
+                              for start, end, tokens in _token_pieces(encoding, chunk_size))
+        
+        chunk_start = chunk_end = None
+        chunk_tokens = 0
+        for para_start, para_end, para_tokens in pieces:
+            if chunk_start is not None and chunk_tokens + para_tokens > chunk_size:
+                chunks.append(self._chunk_record(text[chunk_start:chunk_end], section, page_from))
+                chunk_start, chunk_tokens = para_start, 0
+            elif chunk_start is None:
+                chunk_start = para_start
+            chunk_end = para_end
+            chunk_tokens += para_tokens
         
         # Add final chunk
-        if current_chunk:
-            chunks.append({
-                'text': current_chunk.strip(),
-                'section': section,
-                'page_from': min(current_pages) if current_pages else page_from,
-                'page_to': max(current_pages) if current_pages else page_to,
-                'metadata': {
-                    'chunk_type': 'text',
-                    'word_count': len(current_chunk.split())
-                }
-            })
+        if chunk_start is not None and chunk_end > chunk_start:
+            chunks.append(self._chunk_record(text[chunk_start:chunk_end], section, page_from))
         
         return chunks
     
+    def _chunk_record(self, chunk_text: str, section: str, page: int) -> Dict[str, Any]:
+        """Build a text chunk record"""
+        return {
+            'text': chunk_text.strip(),
+            'section': section,
+            # TODO: Track pages per paragraph; simplified to the section start
+            'page_from': page,
+            'page_to': page,
+            'metadata': {
+                'chunk_type': 'text',
+                'word_count': len(chunk_text.split())
+            }
+        }
+    
     def _extract_figure_number(self, page, bbox) -> str:
         """Extract figure number from page"""
         # TODO: Implement figure number extraction
         return "Figure 1"
     
-    def _extract_caption(self, page, bbox) -> str:
-        """Extract figure caption from page"""
-        # TODO: Implement caption extraction
-        return "Sample figure caption"
+    def _extract_caption(self, blocks: List[tuple], bbox) -> str:
+        """Extract figure caption: the nearest text block below the figure that overlaps it horizontally"""
+        x0, _, x1, y1 = bbox
+        below = [
+            block for block in blocks
+            if block[6] == 0 and block[1] >= y1 and block[0] < x1 and block[2] > x0
+        ]
+        if not below:
+            return ""
+        return min(below, key=lambda block: block[1])[4].strip()
     
     def _extract_table_title(self, page, table_idx) -> str:
         """Extract table title"""
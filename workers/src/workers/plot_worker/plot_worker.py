@@ -9,25 +9,95 @@ import asyncio
 import json
 import io
 import base64
-from typing import Dict, List, Optional, Any, Union
+import hashlib
+import operator
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 import pandas as pd
 import numpy as np
+import orjson
+import polars as pl
+import pyarrow as pa
 import plotly.graph_objects as go
 import plotly.express as px
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import matplotlib.pyplot as plt
 import matplotlib
 matplotlib.use('Agg')  # Use non-interactive backend
 import seaborn as sns
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_serializer
+from tsdownsample import LTTBDownsampler
 
 import structlog
 
+from ..concurrency import cpu_share
+
 logger = structlog.get_logger(__name__)
 
+# Derived frames (column subsets, astype, facet slices) share buffers with
+# their parent until written, so no step needs a defensive deep copy
+pd.set_option('mode.copy_on_write', True)
+
+# Kaleido runs one long-lived Chromium subprocess per scope (None when the
+# package is missing); configure it once and skip the MathJax load
+_KALEIDO_SCOPE = pio.kaleido.scope
+if _KALEIDO_SCOPE is not None:
+    _KALEIDO_SCOPE.default_format = "png"
+    _KALEIDO_SCOPE.default_width = 800
+    _KALEIDO_SCOPE.default_height = 600
+    _KALEIDO_SCOPE.mathjax = None
+
+# Points kept per line/scatter plot; beyond this an 800x600 render looks the same
+DOWNSAMPLE_TARGET = 20_000
+
+_PLOT_CODE = string.Template("""import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Load your data
+data = pd.read_csv('your_data.csv')  # Replace with your data source
+
+# Apply transforms
+${transforms}
+# Create plot
+fig = px.${plot_type}(
+    data,
+${arguments})
+
+# Display plot
+fig.show()""")
+
+_FACETED_PLOT_CODE = string.Template("""import pandas as pd
+import plotly.express as px
+
+# Load your data
+data = pd.read_csv('your_data.csv')  # Replace with your data source
+
+# Create faceted plot
+fig = px.${plot_type}(
+    data,
+${arguments})
+
+# Display plot
+fig.show()""")
+
+# pandas equivalents of the filter operators, formatted with repr()'d operands
+_FILTER_CODE = {
+    **{op: f"data = data[data[{{column}}] {op} {{value}}]" for op in ("==", "!=", ">", "<", ">=", "<=")},
+    "in": "data = data[data[{column}].isin({value})]",
+    "contains": "data = data[data[{column}].str.contains({value}, na=False)]",
+}
+
+# Rendered payload: (png_data, svg_data, plotly_json, python_code)
+RenderedPlot = Tuple[bytes, str, str, str]
+
 
 class PlotSpec(BaseModel):
     """Plot specification schema"""
@@ -51,17 +121,129 @@ class PlotResult(BaseModel):
     """Plot generation result"""
     plot_id: str
     spec: PlotSpec
-    png_data: Optional[str] = None  # Base64 encoded PNG
+    png_data: Optional[bytes] = None  # Raw PNG; base64 only in JSON
     svg_data: Optional[str] = None  # SVG string
     plotly_json: Optional[str] = None  # Plotly figure JSON
     python_code: Optional[str] = None  # Generated Python code
     error: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    @property
+    def png_base64(self) -> Optional[str]:
+        """PNG as a base64 string, for JSON and data: URIs"""
+        return base64.b64encode(self.png_data).decode('ascii') if self.png_data else self.png_data
+    
+    @field_serializer('png_data', when_used='json')
+    def _serialize_png(self, png_data: Optional[bytes]) -> Optional[str]:
+        # Standard alphabet; pydantic's own bytes encoding is URL-safe base64
+        return self.png_base64
+    
+    @property
+    def plotly_dict(self) -> Optional[Dict[str, Any]]:
+        """Plotly figure as a dict, for stores that take JSON documents directly"""
+        return orjson.loads(self.plotly_json) if self.plotly_json else None
+
+
+class RenderedPlotCache:
+    """
+    Thread-safe LRU of rendered plots
+
+    Keys are a hash of the spec (minus plot_id/created_at) and the input
+    frame, so identical plots re-issued on dashboard refresh skip
+    transforms, figure building and Kaleido entirely.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, RenderedPlot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[RenderedPlot]:
+        with self._lock:
+            rendered = self._entries.get(key)
+            if rendered is not None:
+                self._entries.move_to_end(key)
+            return rendered
+
+    def put(self, key: str, rendered: RenderedPlot):
+        with self._lock:
+            self._entries[key] = rendered
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_RENDER_CACHE = RenderedPlotCache()
+
+_PLOT_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _plot_pool() -> ProcessPoolExecutor:
+    """Process pool for batch renders, created on first use"""
+    global _PLOT_POOL
+    if _PLOT_POOL is None:
+        _PLOT_POOL = ProcessPoolExecutor(max_workers=cpu_share())
+    return _PLOT_POOL
+
+
+def _frame_to_payload(data: pd.DataFrame) -> Union[bytes, pd.DataFrame]:
+    """Arrow IPC stream for the frame, or the frame itself if Arrow can't hold it"""
+    try:
+        table = pa.Table.from_pandas(data)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return data
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+@lru_cache(maxsize=1)
+def _process_worker() -> "PlotWorker":
+    """Per-process worker, so each pool process keeps its own Kaleido scope and render cache"""
+    return PlotWorker()
+
+
+def _render_one(spec: PlotSpec, payload: Union[bytes, pd.DataFrame]) -> PlotResult:
+    """Pool entry point: rebuild the frame and render one plot"""
+    data = pa.ipc.open_stream(payload).read_pandas() if isinstance(payload, bytes) else payload
+    return asyncio.run(_process_worker().create_plot(spec, data))
+
+
+def _render_cache_key(spec: PlotSpec, data: pd.DataFrame) -> Optional[str]:
+    """Stable hash of spec and data, or None if the frame can't be hashed"""
+    try:
+        row_hashes = pd.util.hash_pandas_object(data, index=True).values
+    except TypeError:
+        # Unhashable cells (lists, dicts); render without caching
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(spec.model_dump_json(exclude={'created_at', 'plot_id'}).encode('utf-8'))
+    # Row hashes ignore column labels, so fold them in explicitly
+    digest.update(repr([(str(c), str(t)) for c, t in data.dtypes.items()]).encode('utf-8'))
+    digest.update(row_hashes.tobytes())
+    return digest.hexdigest()
 
 
 class PlotWorker:
     """Worker for generating plots with transforms and server-side rendering"""
     
+    _FILTER_OPS = {
+        "==": operator.eq,
+        "!=": operator.ne,
+        ">": operator.gt,
+        "<": operator.lt,
+        ">=": operator.ge,
+        "<=": operator.le,
+        "in": lambda column, value: column.is_in(value),
+        # Regex match, as str.contains defaults to; null cells never match, like na=False
+        "contains": lambda column, value: column.str.contains(value),
+    }
+    
     def __init__(self):
         self.logger = logger.bind(worker="plot")
         self.supported_plot_types = [
@@ -72,6 +254,36 @@ class PlotWorker:
             "filter", "group", "aggregate", "pivot", "melt", 
             "log", "standardize", "sort", "limit"
         ]
+        # Held so the renderer subprocess is reused across plots
+        self.kaleido_scope = _KALEIDO_SCOPE
+    
+    def shutdown(self):
+        """Stop the Kaleido renderer subprocess; the next render restarts it"""
+        if self.kaleido_scope is not None:
+            self.kaleido_scope._shutdown_kaleido()
+    
+    async def create_plots(self, specs_and_data: List[Tuple[PlotSpec, pd.DataFrame]]) -> List[PlotResult]:
+        """
+        Render a batch of independent plots across processes
+        
+        Transforms and figure building hold the GIL, so each plot runs in a
+        pool process with its own interpreter and Kaleido renderer. Frames
+        cross the process boundary as Arrow IPC streams.
+        """
+        if len(specs_and_data) <= 1:
+            return [await self.create_plot(spec, data) for spec, data in specs_and_data]
+        
+        loop = asyncio.get_running_loop()
+        pool = _plot_pool()
+        
+        async def render(spec: PlotSpec, data: pd.DataFrame) -> PlotResult:
+            try:
+                return await loop.run_in_executor(pool, _render_one, spec, _frame_to_payload(data))
+            except Exception as e:
+                self.logger.error("Failed to create plot", plot_id=spec.plot_id, error=str(e))
+                return PlotResult(plot_id=spec.plot_id, spec=spec, error=str(e))
+        
+        return list(await asyncio.gather(*(render(spec, data) for spec, data in specs_and_data)))
     
     async def create_plot(self, spec: PlotSpec, data: pd.DataFrame) -> PlotResult:
         """
@@ -87,17 +299,36 @@ class PlotWorker:
         try:
             self.logger.info("Creating plot", plot_id=spec.plot_id, plot_type=spec.plot_type)
             
+            cache_key = _render_cache_key(spec, data)
+            cached = _RENDER_CACHE.get(cache_key) if cache_key else None
+            if cached is not None:
+                png_data, svg_data, plotly_json, python_code = cached
+                self.logger.info("Plot served from render cache", plot_id=spec.plot_id)
+                return PlotResult(
+                    plot_id=spec.plot_id,
+                    spec=spec,
+                    png_data=png_data,
+                    svg_data=svg_data,
+                    plotly_json=plotly_json,
+                    python_code=python_code
+                )
+            
             # Apply data transforms
-            transformed_data = await self._apply_transforms(data, spec.transforms)
+            transformed_data = self._apply_transforms(data, spec.transforms)
             
             # Create plotly figure
-            fig = await self._create_plotly_figure(spec, transformed_data)
+            fig = self._prune_figure(self._create_plotly_figure(spec, transformed_data))
             
             # Generate different output formats
-            png_data = await self._render_png(fig)
-            svg_data = await self._render_svg(fig)
-            plotly_json = fig.to_json()
-            python_code = await self._generate_python_code(spec, transformed_data)
+            png_data, svg_data = await self._render_images(fig)
+            # orjson with numpy arrays serialized natively; only falls back to
+            # Plotly's cleaning pass for values orjson can't encode
+            plotly_json = fig.to_json(engine="orjson")
+            python_code = self._generate_python_code(spec, transformed_data)
+            
+            # Don't pin a failed Kaleido render in the cache
+            if cache_key and png_data and svg_data:
+                _RENDER_CACHE.put(cache_key, (png_data, svg_data, plotly_json, python_code))
             
             result = PlotResult(
                 plot_id=spec.plot_id,
@@ -119,10 +350,14 @@ class PlotWorker:
                 error=str(e)
             )
     
-    async def _apply_transforms(self, data: pd.DataFrame, transforms: List[Dict[str, Any]]) -> pd.DataFrame:
+    def _apply_transforms(self, data: pd.DataFrame, transforms: List[Dict[str, Any]]) -> pd.DataFrame:
         """
         Apply data transformations to the input DataFrame
         
+        Transforms are chained onto a single Polars lazy query and collected
+        once, so filters are pushed down and fused with the steps after them
+        and group-bys run in parallel. The input frame is never modified.
+        
         Args:
             data: Input DataFrame
             transforms: List of transform specifications
@@ -130,86 +365,151 @@ class PlotWorker:
         Returns:
             Transformed DataFrame
         """
-        result = data.copy()
+        if not transforms:
+            # Nothing to do; under copy-on-write the caller's frame is safe to share
+            return data
+        
+        result = self._to_lazy(data)
+        predicates: List[pl.Expr] = []
         
         for transform in transforms:
             transform_type = transform.get("type")
             
             if transform_type == "filter":
-                result = await self._apply_filter(result, transform)
-            elif transform_type == "group":
-                result = await self._apply_group(result, transform)
+                # Runs of filters become one conjunctive predicate evaluated
+                # in the same pass as the step that consumes them
+                predicate = self._filter_predicate(transform, result.schema)
+                if predicate is not None:
+                    predicates.append(predicate)
+                continue
+            
+            if predicates:
+                result = result.filter(*predicates)
+                predicates = []
+            
+            if transform_type == "group":
+                result = self._apply_group(result, transform)
             elif transform_type == "aggregate":
-                result = await self._apply_aggregate(result, transform)
+                result = self._apply_aggregate(result, transform)
             elif transform_type == "pivot":
-                result = await self._apply_pivot(result, transform)
+                result = self._apply_pivot(result, transform)
             elif transform_type == "melt":
-                result = await self._apply_melt(result, transform)
+                result = self._apply_melt(result, transform)
             elif transform_type == "log":
-                result = await self._apply_log(result, transform)
+                result = self._apply_log(result, transform)
             elif transform_type == "standardize":
-                result = await self._apply_standardize(result, transform)
+                result = self._apply_standardize(result, transform)
             elif transform_type == "sort":
-                result = await self._apply_sort(result, transform)
+                result = self._apply_sort(result, transform)
             elif transform_type == "limit":
-                result = await self._apply_limit(result, transform)
+                result = self._apply_limit(result, transform)
             else:
                 self.logger.warning("Unknown transform type", transform_type=transform_type)
         
-        return result
+        if predicates:
+            result = result.filter(*predicates)
+        
+        # Plotly express consumes pandas; converting into freshly allocated
+        # blocks keeps the frame writable, like the untransformed input
+        return result.collect(streaming=True).to_pandas()
     
-    async def _apply_filter(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
-        """Apply filter transform"""
+    def _to_lazy(self, data: pd.DataFrame) -> pl.LazyFrame:
+        """Convert the input frame to a Polars lazy query"""
+        try:
+            return pl.from_pandas(data).lazy()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Columns mixing Python types have no Arrow equivalent; carry them
+            # as strings, leaving missing cells null rather than "None"
+            stringified = data.copy(deep=False)
+            for column in data.columns:
+                if data[column].dtype == object:
+                    stringified[column] = data[column].map(str, na_action='ignore')
+            return pl.from_pandas(stringified).lazy()
+    
+    def _filter_predicate(self, transform: Dict[str, Any], schema: Dict[str, pl.DataType]) -> Optional[pl.Expr]:
+        """Build the row predicate for a filter transform, None for unknown operators"""
+        op = transform.get("operator", "==")
+        predicate = self._FILTER_OPS.get(op)
+        if predicate is None:
+            return None
+        
         column = transform.get("column")
-        operator = transform.get("operator", "==")
         value = transform.get("value")
+        if op != "contains" and column in schema:
+            value = self._filter_operand(value, schema[column], many=(op == "in"))
+        return predicate(pl.col(column), value)
+    
+    def _filter_operand(self, value: Any, dtype: pl.DataType, many: bool = False) -> Any:
+        """
+        Filter value cast to the column's dtype, as pandas compared them
         
-        if operator == "==":
-            return data[data[column] == value]
-        elif operator == "!=":
-            return data[data[column] != value]
-        elif operator == ">":
-            return data[data[column] > value]
-        elif operator == "<":
-            return data[data[column] < value]
-        elif operator == ">=":
-            return data[data[column] >= value]
-        elif operator == "<=":
-            return data[data[column] <= value]
-        elif operator == "in":
-            return data[data[column].isin(value)]
-        elif operator == "contains":
-            return data[data[column].str.contains(value, na=False)]
-        
-        return data
+        Date strings such as "2024-02-15" become dates, and "1" becomes 1 on
+        an integer column. Values that don't convert become null and match
+        no rows.
+        """
+        values = list(value) if many else [value]
+        if dtype == pl.Date or dtype == pl.Datetime:
+            operand = pl.from_pandas(pd.to_datetime(pd.Series(values, dtype=object), errors='coerce'))
+        else:
+            operand = pl.Series(values, strict=False)
+        operand = operand.cast(dtype, strict=False)
+        return operand if many else pl.lit(operand[0], dtype=dtype)
     
-    async def _apply_group(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_group(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply group transform"""
         group_columns = transform.get("columns", [])
         if group_columns:
-            return data.groupby(group_columns).first().reset_index()
+            # groupby().first(): per group, the first non-null value of each
+            # column; rows with a null key form no group
+            return (
+                data.drop_nulls(subset=group_columns)
+                .group_by(group_columns, maintain_order=True)
+                .agg(pl.all().drop_nulls().first())
+                .sort(group_columns)
+            )
         return data
     
-    async def _apply_aggregate(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_aggregate(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply aggregate transform"""
         group_columns = transform.get("group_by", [])
         agg_dict = transform.get("aggregations", {})
         
         if group_columns and agg_dict:
-            return data.groupby(group_columns).agg(agg_dict).reset_index()
+            aggregations = []
+            for column, functions in agg_dict.items():
+                if isinstance(functions, str):
+                    aggregations.append(self._aggregation(column, functions).alias(column))
+                else:
+                    aggregations.extend(
+                        self._aggregation(column, function).alias(f"{column}_{function}")
+                        for function in functions
+                    )
+            # pandas-style output: one row per group, ordered by the group keys
+            return data.group_by(group_columns).agg(aggregations).sort(group_columns)
         return data
     
-    async def _apply_pivot(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _aggregation(self, column: str, function: str) -> pl.Expr:
+        """Polars expression for a pandas-style aggregation name"""
+        expr = pl.col(column)
+        if function == "count":
+            return expr.count()
+        if function == "nunique":
+            return expr.n_unique()
+        return getattr(expr, function)()
+    
+    def _apply_pivot(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply pivot transform"""
         index = transform.get("index")
         columns = transform.get("columns")
         values = transform.get("values")
         
         if index and columns and values:
-            return data.pivot(index=index, columns=columns, values=values).reset_index()
+            # Pivoting needs the distinct column values, so it materializes here
+            pivoted = data.collect().pivot(index=index, columns=columns, values=values, aggregate_function=None)
+            return pivoted.sort(index).lazy()
         return data
     
-    async def _apply_melt(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_melt(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply melt transform"""
         id_vars = transform.get("id_vars", [])
         value_vars = transform.get("value_vars", [])
@@ -220,53 +520,59 @@ class PlotWorker:
             return data.melt(
                 id_vars=id_vars, 
                 value_vars=value_vars,
-                var_name=var_name,
+                variable_name=var_name,
                 value_name=value_name
             )
         return data
     
-    async def _apply_log(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_log(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply log transform"""
         column = transform.get("column")
         base = transform.get("base", 10)
         
         if column and column in data.columns:
             if base == 10:
-                data[column] = np.log10(data[column])
+                expr = pl.col(column).log10()
             elif base == 2:
-                data[column] = np.log2(data[column])
+                expr = pl.col(column).log(2)
             else:
-                data[column] = np.log(data[column])
+                expr = pl.col(column).log()
+            return data.with_columns(expr.alias(column))
         
         return data
     
-    async def _apply_standardize(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_standardize(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply standardization transform"""
         column = transform.get("column")
         
         if column and column in data.columns:
-            mean_val = data[column].mean()
-            std_val = data[column].std()
-            if std_val > 0:
-                data[column] = (data[column] - mean_val) / std_val
+            values = pl.col(column)
+            std_val = values.std()
+            return data.with_columns(
+                pl.when(std_val > 0)
+                .then((values - values.mean()) / std_val)
+                .otherwise(values)
+                .alias(column)
+            )
         
         return data
     
-    async def _apply_sort(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_sort(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply sort transform"""
         column = transform.get("column")
         ascending = transform.get("ascending", True)
         
         if column and column in data.columns:
-            return data.sort_values(column, ascending=ascending)
+            # Missing values go last in either direction, as with sort_values
+            return data.sort(column, descending=not ascending, nulls_last=True, maintain_order=True)
         return data
     
-    async def _apply_limit(self, data: pd.DataFrame, transform: Dict[str, Any]) -> pd.DataFrame:
+    def _apply_limit(self, data: pl.LazyFrame, transform: Dict[str, Any]) -> pl.LazyFrame:
         """Apply limit transform"""
         limit = transform.get("limit", 1000)
         return data.head(limit)
     
-    async def _create_plotly_figure(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_plotly_figure(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """
         Create a Plotly figure based on specification and data
         
@@ -280,28 +586,29 @@ class PlotWorker:
         plot_type = spec.plot_type.lower()
         
         if plot_type == "line":
-            return await self._create_line_plot(spec, data)
+            return self._create_line_plot(spec, data)
         elif plot_type == "bar":
-            return await self._create_bar_plot(spec, data)
+            return self._create_bar_plot(spec, data)
         elif plot_type == "scatter":
-            return await self._create_scatter_plot(spec, data)
+            return self._create_scatter_plot(spec, data)
         elif plot_type == "box":
-            return await self._create_box_plot(spec, data)
+            return self._create_box_plot(spec, data)
         elif plot_type == "violin":
-            return await self._create_violin_plot(spec, data)
+            return self._create_violin_plot(spec, data)
         elif plot_type == "histogram":
-            return await self._create_histogram_plot(spec, data)
+            return self._create_histogram_plot(spec, data)
         elif plot_type == "heatmap":
-            return await self._create_heatmap_plot(spec, data)
+            return self._create_heatmap_plot(spec, data)
         elif plot_type == "area":
-            return await self._create_area_plot(spec, data)
+            return self._create_area_plot(spec, data)
         elif plot_type == "pie":
-            return await self._create_pie_plot(spec, data)
+            return self._create_pie_plot(spec, data)
         else:
             raise ValueError(f"Unsupported plot type: {plot_type}")
     
-    async def _create_line_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_line_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create line plot"""
+        data = self._maybe_downsample(data, spec)
         fig = px.line(
             data,
             x=spec.x_column,
@@ -312,11 +619,47 @@ class PlotWorker:
         )
         
         if spec.error_bars:
-            fig = self._add_error_bars(fig, spec.error_bars, data)
+            fig = self._add_error_bars(fig, spec.error_bars, data, spec.color_column)
         
         return fig
     
-    async def _create_bar_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _maybe_downsample(self, data: pd.DataFrame, spec: PlotSpec,
+                          target: int = DOWNSAMPLE_TARGET) -> pd.DataFrame:
+        """
+        Thin line/scatter data that has more points than a render can show
+        
+        Lines keep their shape via LTTB, applied per color trace with each
+        trace's share of the target; scatters get a uniform sample. Row order
+        is preserved, and data LTTB can't handle (non-numeric or unsorted x,
+        missing values) is passed through untouched.
+        """
+        if len(data) <= target:
+            return data
+        
+        if spec.plot_type == "scatter":
+            return data.iloc[np.sort(np.random.default_rng(0).choice(len(data), target, replace=False))]
+        
+        x, y = spec.x_column, spec.y_column
+        if not x or not y or data[[x, y]].isna().any(axis=None):
+            return data
+        
+        color = spec.color_column if spec.color_column in data.columns else None
+        groups = data.groupby(color, sort=False).indices.values() if color else [np.arange(len(data))]
+        downsampler = LTTBDownsampler()
+        keep = []
+        for rows in groups:
+            xs = data[x].to_numpy()[rows]
+            ys = data[y].to_numpy()[rows]
+            if xs.dtype.kind == "M":
+                xs = xs.view(np.int64)
+            if xs.dtype.kind not in "iuf" or ys.dtype.kind not in "iuf" or np.any(np.diff(xs) < 0):
+                return data
+            n_out = max(3, target * len(rows) // len(data))
+            keep.append(rows[downsampler.downsample(xs, ys, n_out=n_out)] if len(rows) > n_out else rows)
+        
+        return data.iloc[np.sort(np.concatenate(keep))]
+    
+    def _create_bar_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create bar plot"""
         fig = px.bar(
             data,
@@ -328,12 +671,13 @@ class PlotWorker:
         )
         
         if spec.error_bars:
-            fig = self._add_error_bars(fig, spec.error_bars, data)
+            fig = self._add_error_bars(fig, spec.error_bars, data, spec.color_column)
         
         return fig
     
-    async def _create_scatter_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_scatter_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create scatter plot"""
+        data = self._maybe_downsample(data, spec)
         fig = px.scatter(
             data,
             x=spec.x_column,
@@ -344,11 +688,11 @@ class PlotWorker:
         )
         
         if spec.error_bars:
-            fig = self._add_error_bars(fig, spec.error_bars, data)
+            fig = self._add_error_bars(fig, spec.error_bars, data, spec.color_column)
         
         return fig
     
-    async def _create_box_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_box_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create box plot"""
         fig = px.box(
             data,
@@ -360,7 +704,7 @@ class PlotWorker:
         )
         return fig
     
-    async def _create_violin_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_violin_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create violin plot"""
         fig = px.violin(
             data,
@@ -372,7 +716,7 @@ class PlotWorker:
         )
         return fig
     
-    async def _create_histogram_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_histogram_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create histogram plot"""
         fig = px.histogram(
             data,
@@ -383,16 +727,12 @@ class PlotWorker:
         )
         return fig
     
-    async def _create_heatmap_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_heatmap_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create heatmap plot"""
         # For heatmap, we need to pivot the data
         if spec.x_column and spec.y_column:
-            pivot_data = data.pivot_table(
-                index=spec.y_column,
-                columns=spec.x_column,
-                values=spec.color_column or spec.y_column,
-                aggfunc='mean'
-            )
+            pivot_data = self._mean_grid(data, spec.x_column, spec.y_column,
+                                         spec.color_column or spec.y_column)
             
             fig = px.imshow(
                 pivot_data,
@@ -401,7 +741,7 @@ class PlotWorker:
             )
         else:
             # Use correlation matrix if no specific columns
-            corr_matrix = data.corr()
+            corr_matrix = self._correlation_matrix(data)
             fig = px.imshow(
                 corr_matrix,
                 title=spec.title,
@@ -410,7 +750,57 @@ class PlotWorker:
         
         return fig
     
-    async def _create_area_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _correlation_matrix(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pearson correlation of the numeric columns
+        
+        Computed as one float32 GEMM over standardized columns, which is
+        plenty of precision for a heatmap. Frames with missing values keep
+        pandas' pairwise-complete corr().
+        """
+        numeric = data.select_dtypes(include=np.number)
+        columns = numeric.columns
+        X = numeric.to_numpy(dtype=np.float32, copy=True)
+        if len(X) < 2 or np.isnan(X).any():
+            return numeric.corr()
+        
+        X -= X.mean(axis=0)
+        std = X.std(axis=0, ddof=1)
+        # Constant columns have no defined correlation, as in pandas
+        std[std == 0] = np.nan
+        X /= std
+        corr = (X.T @ X) / (X.shape[0] - 1)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        np.fill_diagonal(corr, np.where(np.isnan(std), np.nan, 1.0))
+        
+        return pd.DataFrame(corr, index=columns, columns=columns)
+    
+    def _mean_grid(self, data: pd.DataFrame, x_column: str, y_column: str, value_column: str) -> pd.DataFrame:
+        """
+        Mean of value_column per (y, x) cell, laid out like pivot_table(aggfunc='mean')
+        
+        Keys are factorized to integer codes and summed with two bincount
+        passes, so the cost is O(n) regardless of the number of cells.
+        Rows with a missing key or value are skipped.
+        """
+        values = data[value_column].to_numpy(dtype=np.float64)
+        valid = ~(data[x_column].isna().to_numpy() | data[y_column].isna().to_numpy() | np.isnan(values))
+        x_codes, x_labels = pd.factorize(data[x_column][valid], sort=True)
+        y_codes, y_labels = pd.factorize(data[y_column][valid], sort=True)
+        
+        cells = len(y_labels) * len(x_labels)
+        index = y_codes * len(x_labels) + x_codes
+        sums = np.bincount(index, weights=values[valid], minlength=cells)
+        counts = np.bincount(index, minlength=cells)
+        grid = np.divide(sums, counts, out=np.full(cells, np.nan), where=counts > 0)
+        
+        return pd.DataFrame(
+            grid.reshape(len(y_labels), len(x_labels)),
+            index=pd.Index(y_labels, name=y_column),
+            columns=pd.Index(x_labels, name=x_column)
+        )
+    
+    def _create_area_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create area plot"""
         fig = px.area(
             data,
@@ -422,7 +812,7 @@ class PlotWorker:
         )
         return fig
     
-    async def _create_pie_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
+    def _create_pie_plot(self, spec: PlotSpec, data: pd.DataFrame) -> go.Figure:
         """Create pie plot"""
         fig = px.pie(
             data,
@@ -433,21 +823,30 @@ class PlotWorker:
         )
         return fig
     
-    def _add_error_bars(self, fig: go.Figure, error_config: Dict[str, Any], data: pd.DataFrame) -> go.Figure:
-        """Add error bars to the figure"""
+    def _add_error_bars(self, fig: go.Figure, error_config: Dict[str, Any], data: pd.DataFrame,
+                        color_column: Optional[str] = None) -> go.Figure:
+        """Add error bars to the figure, one slice of the error column per trace"""
         error_type = error_config.get("type", "std")
         error_column = error_config.get("column")
         
-        if error_column and error_column in data.columns:
-            if error_type == "std":
-                error_values = data[error_column]
-            elif error_type == "se":
-                # Standard error
-                error_values = data[error_column] / np.sqrt(len(data))
-            else:
-                error_values = data[error_column]
-            
-            # Add error bars to the last trace
+        if not fig.data or not error_column or error_column not in data.columns:
+            return fig
+        
+        # Own a writable float buffer (transformed columns may alias Arrow memory)
+        error_values = data[error_column].to_numpy(dtype=np.float64, copy=True)
+        if error_type == "se":
+            # Standard error
+            np.divide(error_values, np.sqrt(len(data)), out=error_values)
+        
+        if color_column and color_column in data.columns and len(fig.data) > 1:
+            # Plotly express splits by color into traces named after each value,
+            # keeping row order within a group
+            positions = {str(key): rows for key, rows in data.groupby(color_column, sort=False).indices.items()}
+            for trace in fig.data:
+                rows = positions.get(trace.name)
+                if rows is not None:
+                    trace.error_y = dict(type='data', array=error_values[rows], visible=True)
+        else:
             fig.data[-1].error_y = dict(
                 type='data',
                 array=error_values,
@@ -456,72 +855,97 @@ class PlotWorker:
         
         return fig
     
-    async def _render_png(self, fig: go.Figure) -> str:
-        """Render plot as PNG and return base64 encoded string"""
+    def _prune_figure(self, fig: go.Figure) -> go.Figure:
+        """
+        Drop figure content that would be serialized but never painted
+        
+        Removes hidden traces, traces without any data points, empty
+        annotations, and hides subplot axes no trace draws on (the unused
+        cells of a facet grid).
+        """
+        fig.data = [
+            trace for trace in fig.data
+            if trace.visible is not False and not self._is_empty_trace(trace)
+        ]
+        if fig.layout.annotations:
+            fig.layout.annotations = [note for note in fig.layout.annotations if note.text]
+        
+        used_axes = set()
+        for trace in fig.data:
+            used_axes.add(getattr(trace, 'xaxis', None) or 'x')
+            used_axes.add(getattr(trace, 'yaxis', None) or 'y')
+        for axis_name in fig.layout:
+            if axis_name.startswith(('xaxis', 'yaxis')):
+                # layout "xaxis2" is referenced by traces as "x2"
+                if axis_name[0] + axis_name[5:] not in used_axes:
+                    fig.layout[axis_name].visible = False
+        
+        return fig
+    
+    def _is_empty_trace(self, trace) -> bool:
+        """Whether every data array a trace defines is empty"""
+        arrays = [
+            getattr(trace, attr) for attr in ('x', 'y', 'z', 'values')
+            if getattr(trace, attr, None) is not None
+        ]
+        return bool(arrays) and all(len(array) == 0 for array in arrays)
+    
+    async def _render_images(self, fig: go.Figure) -> Tuple[bytes, str]:
+        """Render PNG and SVG concurrently; each export runs on its own thread"""
+        return tuple(await asyncio.gather(self._render_png(fig), self._render_svg(fig)))
+    
+    async def _render_png(self, fig: go.Figure) -> bytes:
+        """Render plot as PNG and return the raw bytes"""
         try:
-            # Convert to static image
-            img_bytes = fig.to_image(format="png", width=800, height=600)
-            return base64.b64encode(img_bytes).decode('utf-8')
+            # Convert to static image; Kaleido blocks, so keep it off the event loop
+            return await asyncio.to_thread(fig.to_image, format="png", width=800, height=600)
         except Exception as e:
             self.logger.error("Failed to render PNG", error=str(e))
-            return ""
+            return b""
     
     async def _render_svg(self, fig: go.Figure) -> str:
         """Render plot as SVG and return SVG string"""
         try:
-            return fig.to_image(format="svg", width=800, height=600)
+            return await asyncio.to_thread(fig.to_image, format="svg", width=800, height=600)
         except Exception as e:
             self.logger.error("Failed to render SVG", error=str(e))
             return ""
     
-    async def _generate_python_code(self, spec: PlotSpec, data: pd.DataFrame) -> str:
+    def _generate_python_code(self, spec: PlotSpec, data: pd.DataFrame) -> str:
         """Generate Python code for the plot"""
-        code_lines = [
-            "import pandas as pd",
-            "import plotly.express as px",
-            "import plotly.graph_objects as go",
-            "",
-            "# Load your data",
-            "data = pd.read_csv('your_data.csv')  # Replace with your data source",
-            "",
-            "# Apply transforms"
-        ]
+        transforms = "".join(
+            f"# Transform {i + 1}: {transform['type'].capitalize()}\n{code}\n"
+            for i, transform in enumerate(spec.transforms)
+            for code in [self._transform_code(transform)] if code
+        )
         
-        # Add transform code
-        for i, transform in enumerate(spec.transforms):
-            transform_type = transform.get("type")
-            if transform_type == "filter":
-                code_lines.append(f"# Transform {i+1}: Filter")
-                code_lines.append(f"data = data[data['{transform.get('column')}'] {transform.get('operator', '==')} {transform.get('value')}]")
-            elif transform_type == "group":
-                code_lines.append(f"# Transform {i+1}: Group")
-                code_lines.append(f"data = data.groupby({transform.get('columns')}).first().reset_index()")
-            elif transform_type == "sort":
-                code_lines.append(f"# Transform {i+1}: Sort")
-                code_lines.append(f"data = data.sort_values('{transform.get('column')}', ascending={transform.get('ascending', True)})")
-        
-        code_lines.extend([
-            "",
-            "# Create plot",
-            f"fig = px.{spec.plot_type}(",
-            f"    data,",
-            f"    x='{spec.x_column}'," if spec.x_column else "    x=None,"
-        ])
-        
-        if spec.y_column:
-            code_lines.append(f"    y='{spec.y_column}',")
-        if spec.color_column:
-            code_lines.append(f"    color='{spec.color_column}',")
-        
-        code_lines.extend([
-            f"    title='{spec.title}',",
-            ")",
-            "",
-            "# Display plot",
-            "fig.show()"
-        ])
-        
-        return "\n".join(code_lines)
+        return _PLOT_CODE.substitute(
+            transforms=transforms,
+            plot_type=spec.plot_type,
+            arguments=self._code_arguments(x=spec.x_column, y=spec.y_column,
+                                           color=spec.color_column, title=spec.title)
+        )
+    
+    def _transform_code(self, transform: Dict[str, Any]) -> Optional[str]:
+        """pandas line reproducing a transform, or None if it isn't exported"""
+        transform_type = transform.get("type")
+        if transform_type == "filter":
+            template = _FILTER_CODE.get(transform.get("operator", "=="))
+            if template:
+                return template.format(column=repr(transform.get("column")), value=repr(transform.get("value")))
+        elif transform_type == "group":
+            return f"data = data.groupby({transform.get('columns')!r}).first().reset_index()"
+        elif transform_type == "sort":
+            return f"data = data.sort_values({transform.get('column')!r}, ascending={transform.get('ascending', True)!r})"
+        return None
+    
+    def _code_arguments(self, **arguments: Any) -> str:
+        """px keyword arguments, one per line; optional columns are left out when unset"""
+        return "".join(
+            f"    {name}={value!r},\n"
+            for name, value in arguments.items()
+            if value is not None or name == "x"
+        )
     
     async def create_faceted_plot(self, spec: PlotSpec, data: pd.DataFrame) -> PlotResult:
         """Create a faceted plot with multiple subplots"""
@@ -529,73 +953,47 @@ class PlotWorker:
             if not spec.facet_column:
                 raise ValueError("Facet column is required for faceted plots")
             
-            # Get unique values for faceting
-            facet_values = data[spec.facet_column].unique()
-            n_facets = len(facet_values)
+            # One vectorized figure build; px lays out and aligns the facets
+            style = spec.style
+            if spec.plot_type == "line":
+                plot_fn = px.line
+                # Markers by default, unless the spec's style says otherwise
+                style = {'markers': True, **spec.style}
+            elif spec.plot_type == "bar":
+                plot_fn = px.bar
+            else:
+                # Default to scatter
+                plot_fn = px.scatter
             
-            # Calculate subplot layout
-            cols = min(3, n_facets)
-            rows = (n_facets + cols - 1) // cols
+            n_facets = data[spec.facet_column].nunique()
+            cols = max(1, min(3, n_facets))
+            rows = max(1, (n_facets + cols - 1) // cols)
             
-            # Create subplots
-            fig = make_subplots(
-                rows=rows, 
-                cols=cols,
-                subplot_titles=[str(val) for val in facet_values],
-                specs=[[{"secondary_y": False}] * cols] * rows
+            fig = plot_fn(
+                data,
+                x=spec.x_column,
+                y=spec.y_column,
+                color=spec.color_column,
+                facet_col=spec.facet_column,
+                facet_col_wrap=cols,
+                title=spec.title,
+                **style
             )
-            
-            # Add traces for each facet
-            for i, facet_value in enumerate(facet_values):
-                row = i // cols + 1
-                col = i % cols + 1
-                
-                facet_data = data[data[spec.facet_column] == facet_value]
-                
-                if spec.plot_type == "line":
-                    trace = go.Scatter(
-                        x=facet_data[spec.x_column],
-                        y=facet_data[spec.y_column],
-                        mode='lines+markers',
-                        name=str(facet_value)
-                    )
-                elif spec.plot_type == "scatter":
-                    trace = go.Scatter(
-                        x=facet_data[spec.x_column],
-                        y=facet_data[spec.y_column],
-                        mode='markers',
-                        name=str(facet_value)
-                    )
-                elif spec.plot_type == "bar":
-                    trace = go.Bar(
-                        x=facet_data[spec.x_column],
-                        y=facet_data[spec.y_column],
-                        name=str(facet_value)
-                    )
-                else:
-                    # Default to scatter
-                    trace = go.Scatter(
-                        x=facet_data[spec.x_column],
-                        y=facet_data[spec.y_column],
-                        mode='markers',
-                        name=str(facet_value)
-                    )
-                
-                fig.add_trace(trace, row=row, col=col)
+            # Title each subplot with the bare facet value, not "column=value"
+            fig.for_each_annotation(lambda annotation: annotation.update(text=annotation.text.split("=", 1)[-1]))
             
             # Update layout
             fig.update_layout(
-                title=spec.title,
                 showlegend=False,
                 height=200 * rows,
                 width=300 * cols
             )
+            self._prune_figure(fig)
             
             # Generate outputs
-            png_data = await self._render_png(fig)
-            svg_data = await self._render_svg(fig)
-            plotly_json = fig.to_json()
-            python_code = await self._generate_faceted_python_code(spec, data)
+            png_data, svg_data = await self._render_images(fig)
+            plotly_json = fig.to_json(engine="orjson")
+            python_code = self._generate_faceted_python_code(spec, data, cols)
             
             return PlotResult(
                 plot_id=spec.plot_id,
@@ -614,35 +1012,11 @@ class PlotWorker:
                 error=str(e)
             )
     
-    async def _generate_faceted_python_code(self, spec: PlotSpec, data: pd.DataFrame) -> str:
-        """Generate Python code for faceted plot"""
-        code_lines = [
-            "import pandas as pd",
-            "import plotly.express as px",
-            "import plotly.graph_objects as go",
-            "from plotly.subplots import make_subplots",
-            "",
-            "# Load your data",
-            "data = pd.read_csv('your_data.csv')  # Replace with your data source",
-            "",
-            "# Create faceted plot",
-            f"fig = px.{spec.plot_type}(",
-            f"    data,",
-            f"    x='{spec.x_column}'," if spec.x_column else "    x=None,"
-        ]
-        
-        if spec.y_column:
-            code_lines.append(f"    y='{spec.y_column}',")
-        if spec.color_column:
-            code_lines.append(f"    color='{spec.color_column}',")
-        
-        code_lines.extend([
-            f"    facet_col='{spec.facet_column}',",
-            f"    title='{spec.title}',",
-            ")",
-            "",
-            "# Display plot",
-            "fig.show()"
-        ])
-        
-        return "\n".join(code_lines)
+    def _generate_faceted_python_code(self, spec: PlotSpec, data: pd.DataFrame, cols: int) -> str:
+        """Generate Python code for faceted plot, wrapped at the rendered column count"""
+        return _FACETED_PLOT_CODE.substitute(
+            plot_type=spec.plot_type,
+            arguments=self._code_arguments(x=spec.x_column, y=spec.y_column,
+                                           color=spec.color_column, facet_col=spec.facet_column,
+                                           facet_col_wrap=cols, title=spec.title)
+        )
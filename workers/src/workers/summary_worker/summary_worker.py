@@ -6,17 +6,56 @@ confidence scoring, and figure/table linking.
 """
 
 import asyncio
+import bisect
 import json
 import logging
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime
 
+import ahocorasick
+import numpy as np
 import structlog
 from pydantic import BaseModel, Field
 
 logger = structlog.get_logger(__name__)
 
+# Phrases marking the start of an experiment
+EXPERIMENT_INDICATORS = [
+    "experiment", "study", "investigation", "analysis",
+    "we conducted", "we performed", "we analyzed",
+    "the experiment", "this study", "our investigation"
+]
+
+# Phrases marking a section break that ends an experiment
+SECTION_BREAKS = ["conclusion", "discussion", "results", "methods"]
+
+OBJECTIVE_INDICATORS = [
+    "objective", "goal", "aim", "purpose", "hypothesis",
+    "we aimed to", "the goal was", "our objective"
+]
+
+DATASET_INDICATORS = [
+    "dataset", "data", "sample", "participants", "subjects",
+    "n=", "sample size", "population"
+]
+
+FINDING_INDICATORS = [
+    "found", "discovered", "observed", "resulted in", "showed",
+    "demonstrated", "revealed", "indicated", "suggested"
+]
+
+LIMITATION_INDICATORS = [
+    "limitation", "constraint", "caveat", "drawback", "weakness",
+    "however", "although", "despite", "nevertheless"
+]
+
+# Sentence boundary: whitespace after terminal punctuation. Unlike a bare
+# split('.'), this keeps decimals ("2.5 mM") inside their sentence
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
 
 @dataclass
 class ExperimentSpan:
@@ -25,9 +64,16 @@ class ExperimentSpan:
     end_chunk_id: str
     title: str
     confidence: float
+    # Inclusive chunk index range of the span within the document
+    start_idx: int
+    end_idx: int
     method_section: Optional[str] = None
     results_section: Optional[str] = None
     limitations_section: Optional[str] = None
+    # Document-level indices of the chunks joined into each section
+    method_chunk_idxs: List[int] = field(default_factory=list)
+    results_chunk_idxs: List[int] = field(default_factory=list)
+    limitations_chunk_idxs: List[int] = field(default_factory=list)
 
 
 class StructuredSummary(BaseModel):
@@ -50,13 +96,54 @@ class StructuredSummary(BaseModel):
 class SummaryWorker:
     """Worker for generating experiment summaries with confidence scoring"""
     
-    def __init__(self):
+    def __init__(self, concurrency_limit: int = 8):
         self.logger = logger.bind(worker="summary")
+        # Bounds concurrent LLM calls when summaries are generated in parallel
+        self._summary_semaphore = asyncio.Semaphore(concurrency_limit)
         self.experiment_keywords = {
             "methodology": ["method", "methodology", "procedure", "protocol", "experiment", "study"],
             "results": ["result", "finding", "outcome", "conclusion", "observation"],
             "limitations": ["limitation", "constraint", "caveat", "drawback", "weakness"]
         }
+        self._automaton = self._build_automaton({
+            **self.experiment_keywords,
+            "experiment_start": EXPERIMENT_INDICATORS,
+            "section_break": SECTION_BREAKS,
+            "objective": OBJECTIVE_INDICATORS,
+            "dataset": DATASET_INDICATORS,
+            "finding": FINDING_INDICATORS,
+            "limitation": LIMITATION_INDICATORS,
+        })
+    
+    def _build_automaton(self, categories: Dict[str, List[str]]) -> ahocorasick.Automaton:
+        """
+        Compile every keyword list into one Aho-Corasick automaton
+        
+        Each keyword maps to (keyword, categories containing it), so one
+        pass over a text answers every "does it mention any of ..." check.
+        """
+        keyword_categories: Dict[str, Set[str]] = defaultdict(set)
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                keyword_categories[keyword].add(category)
+        
+        automaton = ahocorasick.Automaton()
+        for keyword, owners in keyword_categories.items():
+            automaton.add_word(keyword, (keyword, frozenset(owners)))
+        automaton.make_automaton()
+        return automaton
+    
+    def _keyword_hits(self, text: str) -> Dict[str, Set[str]]:
+        """Distinct keywords found in lowercased text, by category"""
+        hits: Dict[str, Set[str]] = defaultdict(set)
+        for _, (keyword, categories) in self._automaton.iter(text):
+            for category in categories:
+                hits[category].add(keyword)
+        return dict(hits)
+    
+    def _mentions(self, text: str, category: str) -> bool:
+        """Whether lowercased text contains any keyword of category"""
+        return any(category in categories for _, (_, categories) in self._automaton.iter(text))
     
     async def process_document(self, document_id: str, chunks: List[Dict]) -> List[StructuredSummary]:
         """
@@ -72,76 +159,106 @@ class SummaryWorker:
         self.logger.info("Processing document for experiment summaries", 
                         document_id=document_id, chunk_count=len(chunks))
         
-        # Detect experiment spans
-        experiment_spans = await self._detect_experiment_spans(chunks)
+        # Lowercase every chunk once; all keyword checks reuse this list, and
+        # the caller's chunk dicts are left untouched
+        lowered = [chunk.get("content", "").lower() for chunk in chunks]
         
-        # Generate summaries for each experiment
-        summaries = []
-        for span in experiment_spans:
-            summary = await self._generate_experiment_summary(document_id, span, chunks)
-            if summary:
-                summaries.append(summary)
+        # Detect experiment spans
+        experiment_spans = await self._detect_experiment_spans(chunks, lowered)
+        
+        # Generate summaries for each experiment concurrently
+        results = await asyncio.gather(
+            *(self._generate_experiment_summary(document_id, span, chunks, lowered) for span in experiment_spans),
+            return_exceptions=True
+        )
+        # Per-span failures are already handled (logged, None) inside
+        # _generate_experiment_summary, so anything here is unexpected: log
+        # every one rather than only the first, then fail the document
+        errors = [result for result in results if isinstance(result, BaseException)]
+        for error in errors:
+            self.logger.error("Experiment summary task failed",
+                              document_id=document_id, error=repr(error))
+        if errors:
+            raise errors[0]
+        summaries = [summary for summary in results if summary is not None]
         
         self.logger.info("Generated experiment summaries", 
                         document_id=document_id, summary_count=len(summaries))
         
         return summaries
     
-    async def _detect_experiment_spans(self, chunks: List[Dict]) -> List[ExperimentSpan]:
+    async def _detect_experiment_spans(self, chunks: List[Dict], lowered: List[str]) -> List[ExperimentSpan]:
         """
         Detect experiment spans in document chunks
         
+        Every chunk is lowercased and scanned by the keyword automaton once.
+        Span ends come from a backward sweep for the next section break, and
+        span confidence from running keyword/length totals, so no chunk is
+        rescanned however many spans cover it.
+        
         Args:
             chunks: List of document chunks
+            lowered: Lowercased content of each chunk
             
         Returns:
             List of detected experiment spans
         """
-        spans = []
+        chunk_hits = [self._keyword_hits(lower) for lower in lowered]
+        
+        # Running totals: any span's keyword count and length is a difference
+        categories = list(self.experiment_keywords)
+        counts = np.array(
+            [[len(hits.get(category, ())) for category in categories] for hits in chunk_hits],
+            dtype=np.int64
+        ).reshape(len(chunks), len(categories))
+        lengths = np.fromiter((len(lower) for lower in lowered), dtype=np.int64, count=len(chunks))
+        keyword_totals = np.concatenate(([0], np.cumsum(counts.sum(axis=1))))
+        length_totals = np.concatenate(([0], np.cumsum(lengths)))
+        
+        # An experiment ends just before the next chunk that opens a new section
+        span_ends = [0] * len(chunks)
+        end_idx = len(chunks) - 1
+        for i in range(len(chunks) - 1, -1, -1):
+            span_ends[i] = end_idx
+            if "section_break" in chunk_hits[i]:
+                end_idx = i - 1
+        
+        # Chunks mentioning each section category, in document order
+        category_idxs = {
+            category: [j for j, hits in enumerate(chunk_hits) if category in hits]
+            for category in self.experiment_keywords
+        }
         
+        spans = []
         for i, chunk in enumerate(chunks):
             # Look for experiment indicators
-            if self._is_experiment_start(chunk):
-                # Find the end of this experiment
-                end_idx = self._find_experiment_end(chunks, i)
-                
-                span = ExperimentSpan(
-                    start_chunk_id=chunk.get("id"),
-                    end_chunk_id=chunks[end_idx].get("id") if end_idx < len(chunks) else chunk.get("id"),
-                    title=self._extract_experiment_title(chunk),
-                    confidence=self._calculate_span_confidence(chunks[i:end_idx+1]),
-                    method_section=self._extract_method_section(chunks[i:end_idx+1]),
-                    results_section=self._extract_results_section(chunks[i:end_idx+1]),
-                    limitations_section=self._extract_limitations_section(chunks[i:end_idx+1])
-                )
-                spans.append(span)
-        
-        return spans
-    
-    def _is_experiment_start(self, chunk: Dict) -> bool:
-        """Check if a chunk indicates the start of an experiment"""
-        content = chunk.get("content", "").lower()
-        
-        # Look for experiment indicators
-        experiment_indicators = [
-            "experiment", "study", "investigation", "analysis",
-            "we conducted", "we performed", "we analyzed",
-            "the experiment", "this study", "our investigation"
-        ]
-        
-        return any(indicator in content for indicator in experiment_indicators)
-    
-    def _find_experiment_end(self, chunks: List[Dict], start_idx: int) -> int:
-        """Find the end of an experiment starting from start_idx"""
-        for i in range(start_idx + 1, len(chunks)):
-            chunk = chunks[i]
-            content = chunk.get("content", "").lower()
+            if "experiment_start" not in chunk_hits[i]:
+                continue
             
-            # Look for section breaks or new experiments
-            if any(phrase in content for phrase in ["conclusion", "discussion", "results", "methods"]):
-                return i - 1
+            end_idx = span_ends[i]
+            method_idxs = self._section_indices(category_idxs["methodology"], i, end_idx)
+            results_idxs = self._section_indices(category_idxs["results"], i, end_idx)
+            limitations_idxs = self._section_indices(category_idxs["limitations"], i, end_idx)
+            span = ExperimentSpan(
+                start_chunk_id=chunk.get("id"),
+                end_chunk_id=chunks[end_idx].get("id"),
+                start_idx=i,
+                end_idx=end_idx,
+                title=self._extract_experiment_title(chunk),
+                confidence=self._calculate_span_confidence(
+                    int(keyword_totals[end_idx+1] - keyword_totals[i]),
+                    int(length_totals[end_idx+1] - length_totals[i])
+                ),
+                method_section=self._join_chunks(chunks, method_idxs),
+                results_section=self._join_chunks(chunks, results_idxs),
+                limitations_section=self._join_chunks(chunks, limitations_idxs),
+                method_chunk_idxs=method_idxs,
+                results_chunk_idxs=results_idxs,
+                limitations_chunk_idxs=limitations_idxs
+            )
+            spans.append(span)
         
-        return len(chunks) - 1
+        return spans
     
     def _extract_experiment_title(self, chunk: Dict) -> str:
         """Extract experiment title from chunk"""
@@ -156,22 +273,8 @@ class SummaryWorker:
         
         return "Experiment"  # Fallback
     
-    def _calculate_span_confidence(self, chunks: List[Dict]) -> float:
-        """Calculate confidence score for experiment span detection"""
-        if not chunks:
-            return 0.0
-        
-        # Count experiment-related keywords
-        total_keywords = 0
-        total_content = 0
-        
-        for chunk in chunks:
-            content = chunk.get("content", "").lower()
-            total_content += len(content)
-            
-            for category, keywords in self.experiment_keywords.items():
-                total_keywords += sum(1 for keyword in keywords if keyword in content)
-        
+    def _calculate_span_confidence(self, total_keywords: int, total_content: int) -> float:
+        """Calculate confidence score for experiment span detection from its keyword tally"""
         if total_content == 0:
             return 0.0
         
@@ -181,40 +284,20 @@ class SummaryWorker:
         
         return round(confidence, 3)
     
-    def _extract_method_section(self, chunks: List[Dict]) -> Optional[str]:
-        """Extract methodology section from experiment chunks"""
-        method_content = []
-        
-        for chunk in chunks:
-            content = chunk.get("content", "")
-            if any(keyword in content.lower() for keyword in self.experiment_keywords["methodology"]):
-                method_content.append(content)
-        
-        return "\n".join(method_content) if method_content else None
-    
-    def _extract_results_section(self, chunks: List[Dict]) -> Optional[str]:
-        """Extract results section from experiment chunks"""
-        results_content = []
-        
-        for chunk in chunks:
-            content = chunk.get("content", "")
-            if any(keyword in content.lower() for keyword in self.experiment_keywords["results"]):
-                results_content.append(content)
-        
-        return "\n".join(results_content) if results_content else None
+    def _section_indices(self, category_idxs: List[int], start_idx: int, end_idx: int) -> List[int]:
+        """Indices from a sorted category index list that fall inside [start_idx, end_idx]"""
+        lo = bisect.bisect_left(category_idxs, start_idx)
+        hi = bisect.bisect_right(category_idxs, end_idx)
+        return category_idxs[lo:hi]
     
-    def _extract_limitations_section(self, chunks: List[Dict]) -> Optional[str]:
-        """Extract limitations section from experiment chunks"""
-        limitations_content = []
-        
-        for chunk in chunks:
-            content = chunk.get("content", "")
-            if any(keyword in content.lower() for keyword in self.experiment_keywords["limitations"]):
-                limitations_content.append(content)
-        
-        return "\n".join(limitations_content) if limitations_content else None
+    def _join_chunks(self, chunks: List[Dict], idxs: List[int]) -> Optional[str]:
+        """Join the content of the indexed chunks into one section, or None if there are none"""
+        if not idxs:
+            return None
+        return "\n".join(chunks[i].get("content", "") for i in idxs)
     
-    async def _generate_experiment_summary(self, document_id: str, span: ExperimentSpan, chunks: List[Dict]) -> Optional[StructuredSummary]:
+    async def _generate_experiment_summary(self, document_id: str, span: ExperimentSpan, chunks: List[Dict],
+                                           lowered: List[str]) -> Optional[StructuredSummary]:
         """
         Generate structured summary for an experiment
         
@@ -222,28 +305,27 @@ class SummaryWorker:
             document_id: ID of the document
             span: Experiment span
             chunks: All document chunks
+            lowered: Lowercased content of each chunk
             
         Returns:
             Structured summary or None if generation fails
         """
         try:
             # Extract relevant chunks for this experiment
-            experiment_chunks = [
-                chunk for chunk in chunks 
-                if chunk.get("id") in [span.start_chunk_id, span.end_chunk_id]
-            ]
+            experiment_chunks = chunks[span.start_idx:span.end_idx+1]
+            experiment_lowered = lowered[span.start_idx:span.end_idx+1]
             
             # Generate summary using LLM (placeholder for now)
-            summary_data = await self._generate_summary_with_llm(experiment_chunks, span)
+            async with self._summary_semaphore:
+                summary_data = await self._generate_summary_with_llm(experiment_chunks, span, experiment_lowered)
             
             if not summary_data:
                 return None
             
             # Link figures and tables
-            linked_figures = await self._link_figures(experiment_chunks)
-            linked_tables = await self._link_tables(experiment_chunks)
+            linked_figures, linked_tables = self._collect_refs(experiment_chunks)
             
-            summary = StructuredSummary(
+            fields = dict(
                 experiment_id=f"{document_id}_{span.start_chunk_id}",
                 title=summary_data.get("title", span.title),
                 objective=summary_data.get("objective", ""),
@@ -264,14 +346,19 @@ class SummaryWorker:
                 }
             )
             
-            return summary
+            # Our own extractors produce well-typed fields, so skip pydantic
+            # validation for them; model output still gets checked in full
+            if summary_data.get("source") == "llm":
+                return StructuredSummary.model_validate(fields)
+            return StructuredSummary.model_construct(**fields)
             
         except Exception as e:
             self.logger.error("Failed to generate experiment summary", 
                             document_id=document_id, span=span, error=str(e))
             return None
     
-    async def _generate_summary_with_llm(self, chunks: List[Dict], span: ExperimentSpan) -> Optional[Dict]:
+    async def _generate_summary_with_llm(self, chunks: List[Dict], span: ExperimentSpan,
+                                         lowered: List[str]) -> Optional[Dict]:
         """
         Generate summary using LLM (placeholder implementation)
         
@@ -282,108 +369,86 @@ class SummaryWorker:
         # TODO: Implement actual LLM integration
         
         content = "\n".join(chunk.get("content", "") for chunk in chunks)
+        lower = "\n".join(lowered)
         
         # Simple heuristic-based summary generation
         summary_data = {
             "title": span.title,
-            "objective": self._extract_objective(content),
+            "objective": self._extract_objective(content, lower),
             "methodology": span.method_section or "Methodology details extracted from document",
-            "dataset_description": self._extract_dataset_info(content),
-            "key_findings": self._extract_key_findings(content),
-            "limitations": self._extract_limitations(content),
-            "citations": []
+            "dataset_description": self._extract_dataset_info(content, lower),
+            "key_findings": self._extract_key_findings(content, lower),
+            "limitations": self._extract_limitations(content, lower),
+            "citations": [],
+            "source": "heuristic"
         }
         
         return summary_data
     
-    def _extract_objective(self, content: str) -> str:
-        """Extract experiment objective from content"""
-        # Look for objective indicators
-        objective_indicators = [
-            "objective", "goal", "aim", "purpose", "hypothesis",
-            "we aimed to", "the goal was", "our objective"
-        ]
-        
-        lines = content.split('\n')
-        for line in lines:
-            line_lower = line.lower()
-            if any(indicator in line_lower for indicator in objective_indicators):
-                return line.strip()
-        
-        return "Objective extracted from experiment context"
+    def _extract_objective(self, content: str, lower: str) -> str:
+        """Extract experiment objective from content (lower is its lowercased copy)"""
+        line = self._first_matching_line(content, lower, "objective")
+        return line if line is not None else "Objective extracted from experiment context"
     
-    def _extract_dataset_info(self, content: str) -> str:
-        """Extract dataset information from content"""
-        # Look for dataset indicators
-        dataset_indicators = [
-            "dataset", "data", "sample", "participants", "subjects",
-            "n=", "sample size", "population"
-        ]
-        
-        lines = content.split('\n')
-        for line in lines:
-            line_lower = line.lower()
-            if any(indicator in line_lower for indicator in dataset_indicators):
-                return line.strip()
-        
-        return "Dataset information extracted from experiment context"
+    def _extract_dataset_info(self, content: str, lower: str) -> str:
+        """Extract dataset information from content (lower is its lowercased copy)"""
+        line = self._first_matching_line(content, lower, "dataset")
+        return line if line is not None else "Dataset information extracted from experiment context"
     
-    def _extract_key_findings(self, content: str) -> List[str]:
-        """Extract key findings from content"""
-        findings = []
-        
-        # Look for finding indicators
-        finding_indicators = [
-            "found", "discovered", "observed", "resulted in", "showed",
-            "demonstrated", "revealed", "indicated", "suggested"
-        ]
-        
-        sentences = content.split('.')
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            if any(indicator in sentence_lower for indicator in finding_indicators):
-                findings.append(sentence.strip())
+    def _first_matching_line(self, content: str, lower: str, category: str) -> Optional[str]:
+        """
+        First line of content that mentions a keyword category, stripped
         
-        return findings[:5]  # Limit to 5 key findings
+        One automaton scan over the whole lowercased text replaces a scan
+        per line; the hit's line is found by counting newlines before it.
+        """
+        for end, (_, categories) in self._automaton.iter(lower):
+            if category in categories:
+                line_idx = lower.count('\n', 0, end)
+                return content.split('\n', line_idx + 1)[line_idx].strip()
+        return None
     
-    def _extract_limitations(self, content: str) -> List[str]:
-        """Extract limitations from content"""
-        limitations = []
-        
-        # Look for limitation indicators
-        limitation_indicators = [
-            "limitation", "constraint", "caveat", "drawback", "weakness",
-            "however", "although", "despite", "nevertheless"
-        ]
-        
-        sentences = content.split('.')
-        for sentence in sentences:
-            sentence_lower = sentence.lower()
-            if any(indicator in sentence_lower for indicator in limitation_indicators):
-                limitations.append(sentence.strip())
-        
-        return limitations[:3]  # Limit to 3 limitations
+    def _extract_key_findings(self, content: str, lower: str) -> List[str]:
+        """Extract key findings from content (lower is its lowercased copy)"""
+        return self._matching_sentences(content, lower, "finding", 5)  # Limit to 5 key findings
     
-    async def _link_figures(self, chunks: List[Dict]) -> List[str]:
-        """Link figures referenced in experiment chunks"""
-        figure_ids = []
-        
-        for chunk in chunks:
-            # Look for figure references in metadata
-            figures = chunk.get("figures", [])
-            for figure in figures:
-                figure_ids.append(figure.get("id"))
+    def _extract_limitations(self, content: str, lower: str) -> List[str]:
+        """Extract limitations from content (lower is its lowercased copy)"""
+        return self._matching_sentences(content, lower, "limitation", 3)  # Limit to 3 limitations
+    
+    def _matching_sentences(self, content: str, lower: str, category: str, limit: int) -> List[str]:
+        """
+        First `limit` sentences of content that mention a keyword category
         
-        return list(set(figure_ids))  # Remove duplicates
+        The automaton scans the whole lowercased text once and each hit is
+        bisected into the sentence containing it. Lowercasing keeps every
+        whitespace and .!? character, so both texts split into the same
+        sentences.
+        """
+        starts = [0] + [m.end() for m in _SENT_RE.finditer(lower)]
+        matched: List[int] = []
+        for end, (_, categories) in self._automaton.iter(lower):
+            if category not in categories:
+                continue
+            idx = bisect.bisect_right(starts, end) - 1
+            if not matched or matched[-1] != idx:
+                matched.append(idx)
+                if len(matched) == limit:
+                    break
+        
+        if not matched:
+            return []
+        sentences = _SENT_RE.split(content)
+        return [sentences[idx].strip() for idx in matched]
     
-    async def _link_tables(self, chunks: List[Dict]) -> List[str]:
-        """Link tables referenced in experiment chunks"""
-        table_ids = []
+    def _collect_refs(self, chunks: List[Dict]) -> Tuple[List[str], List[str]]:
+        """Distinct figure and table IDs referenced in experiment chunks, in one pass"""
+        figure_ids: Set[str] = set()
+        table_ids: Set[str] = set()
         
         for chunk in chunks:
-            # Look for table references in metadata
-            tables = chunk.get("tables", [])
-            for table in tables:
-                table_ids.append(table.get("id"))
+            # Look for figure/table references in metadata
+            figure_ids.update(figure.get("id") for figure in chunk.get("figures", ()))
+            table_ids.update(table.get("id") for table in chunk.get("tables", ()))
         
-        return list(set(table_ids))  # Remove duplicates
+        return list(figure_ids), list(table_ids)
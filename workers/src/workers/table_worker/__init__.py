@@ -3,6 +3,6 @@ Table Worker for AI Scientist Lab Notebook
 Handles table normalization, header inference, units (UCUM), and type inference
 """
 
-from .table_worker import TableWorker
+from .table_worker import TableWorker, table_from_ipc, table_to_ipc
 
-__all__ = ['TableWorker']
+__all__ = ['TableWorker', 'table_from_ipc', 'table_to_ipc']
@@ -5,48 +5,129 @@ Handles table normalization, header inference, units (UCUM), and type inference
 
 import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, Union
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import structlog
 import re
+from dataclasses import dataclass
 from datetime import datetime
 
+from ..concurrency import cpu_share
+
 logger = structlog.get_logger(__name__)
 
+# UCUM (Unified Code for Units of Measure) units by type
+UCUM_UNITS = {
+    'length': ['m', 'cm', 'mm', 'km', 'in', 'ft', 'yd', 'mi'],
+    'mass': ['kg', 'g', 'mg', 'lb', 'oz'],
+    'time': ['s', 'min', 'h', 'd', 'yr', 'ms', 'μs'],
+    'temperature': ['°C', '°F', 'K'],
+    'volume': ['L', 'mL', 'm³', 'cm³', 'gal', 'qt', 'pt'],
+    'area': ['m²', 'cm²', 'km²', 'in²', 'ft²'],
+    'concentration': ['mol/L', 'M', 'mM', 'μM', 'nM', 'pM', '%', 'ppm', 'ppb'],
+    'pressure': ['Pa', 'kPa', 'MPa', 'bar', 'atm', 'psi'],
+    'energy': ['J', 'kJ', 'cal', 'kcal', 'eV'],
+    'power': ['W', 'kW', 'mW', 'μW'],
+    'frequency': ['Hz', 'kHz', 'MHz', 'GHz'],
+    'voltage': ['V', 'mV', 'μV', 'kV'],
+    'current': ['A', 'mA', 'μA', 'nA'],
+    'resistance': ['Ω', 'kΩ', 'MΩ', 'mΩ'],
+    'capacitance': ['F', 'mF', 'μF', 'nF', 'pF'],
+    'inductance': ['H', 'mH', 'μH', 'nH']
+}
+
+
+def _ucum_group(units: List[str]) -> str:
+    """Lowercased, de-duplicated alternation of units, longest first"""
+    lowered = dict.fromkeys(unit.lower() for unit in units)
+    return '|'.join(re.escape(unit) for unit in sorted(lowered, key=len, reverse=True))
+
+
+# All unit types in one alternation, compiled at import: one named group
+# per unit type (m.lastgroup names it), longest units first, and the token
+# boundary checked once around the whole group. The boundary is a
+# lookaround rather than \b so symbol units (°C, %, Ω) match too, and a
+# leading digit is allowed ("37°C", "5mg"). Units are lowercased here and
+# text is lowercased before searching, so no IGNORECASE is needed
+_UCUM_RE = re.compile(
+    r"(?<![^\W\d_])(?:"
+    + "|".join(f"(?P<{unit_type}>{_ucum_group(units)})" for unit_type, units in UCUM_UNITS.items())
+    + r")(?!\w)"
+)
+
+# Runs of anything but ASCII letters/digits become one underscore
+_SANITIZE_RE = re.compile(r'[^a-zA-Z0-9]+')
+
+# Inference stages run here, off the event loop; pandas/NumPy release the GIL
+_TABLE_POOL = ThreadPoolExecutor(max_workers=cpu_share(), thread_name_prefix="table-infer")
+
+# Words that suggest a first-row cell is a column name
+_HEADER_WORDS_RE = re.compile(r'name|id|type|value|unit|date|time', re.IGNORECASE)
+
+# Common date layouts and the explicit pd.to_datetime format for each;
+# a known format parses on pandas' vectorized path instead of per-value
+# format guessing
+_DATETIME_FORMATS = [
+    (re.compile(r'\d{4}-\d{2}-\d{2}'), '%Y-%m-%d'),
+    (re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'), '%Y-%m-%d %H:%M:%S'),
+    (re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?'), 'ISO8601'),
+    (re.compile(r'\d{1,2}/\d{1,2}/\d{4}'), '%m/%d/%Y'),
+]
+
+# Values per column examined by type inference
+TYPE_SAMPLE_SIZE = 10_000
+
+# Lowercased spellings accepted in a boolean column
+_BOOLEAN_VALUES = frozenset({'true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n'})
+
+# Distinct raw values allowed in a boolean column (case variants included)
+_MAX_BOOLEAN_UNIQUES = 32
+
+# Lowercased cell text read as True in boolean columns; anything else is False
+_TRUE_VALUES = frozenset({'true', 'yes', '1', 't', 'y'})
+
+
+def table_to_ipc(table: pa.Table) -> bytes:
+    """Arrow IPC stream for a normalized table, for handoff across processes"""
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def table_from_ipc(payload: Union[bytes, pa.Buffer]) -> pa.Table:
+    """Read a table written by table_to_ipc; the columns reference the payload buffer"""
+    return pa.ipc.open_stream(payload).read_all()
+
+
+@dataclass
+class _ColumnProfile:
+    """Per-column facts computed once and shared by the inference helpers"""
+    non_null: pd.Series  # column with missing cells dropped
+    sample: pd.Series  # bounded sample of non_null used for type inference
+    values: np.ndarray  # sample as a raw array
+    datetime_format: Optional[str] = None  # explicit format found by _is_datetime
+
 
 class TableWorker:
     """Table processing worker for data normalization"""
     
     def __init__(self):
         self.logger = logger.bind(worker="table_worker")
-        
-        # UCUM (Unified Code for Units of Measure) patterns
-        self.ucum_patterns = {
-            'length': r'\b(m|cm|mm|km|in|ft|yd|mi)\b',
-            'mass': r'\b(kg|g|mg|lb|oz)\b',
-            'time': r'\b(s|min|h|d|yr|ms|μs)\b',
-            'temperature': r'\b(°C|°F|K)\b',
-            'volume': r'\b(L|mL|m³|cm³|gal|qt|pt)\b',
-            'area': r'\b(m²|cm²|km²|in²|ft²)\b',
-            'concentration': r'\b(mol/L|M|mM|μM|nM|pM|%|ppm|ppb)\b',
-            'pressure': r'\b(Pa|kPa|MPa|bar|atm|psi)\b',
-            'energy': r'\b(J|kJ|cal|kcal|eV)\b',
-            'power': r'\b(W|kW|mW|μW)\b',
-            'frequency': r'\b(Hz|kHz|MHz|GHz)\b',
-            'voltage': r'\b(V|mV|μV|kV)\b',
-            'current': r'\b(A|mA|μA|nA)\b',
-            'resistance': r'\b(Ω|kΩ|MΩ|mΩ)\b',
-            'capacitance': r'\b(F|mF|μF|nF|pF)\b',
-            'inductance': r'\b(H|mH|μH|nH)\b'
-        }
     
-    async def process_table(self, table_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_table(self, table_data: Dict[str, Any], as_ipc: bool = False) -> Dict[str, Any]:
         """
         Process a table for normalization
         
         Args:
             table_data: Table data and metadata
+            as_ipc: Return normalized_data as an Arrow IPC stream (bytes) for
+                workers in another process; by default it is the pa.Table
+                itself, which in-process consumers share without copying
             
         Returns:
             Normalized table with schema and metadata
@@ -55,25 +136,40 @@ class TableWorker:
             self.logger.info("Starting table processing", 
                            table_id=table_data.get('table_id'))
             
-            # Extract table data
-            raw_data = table_data.get('data', [])
+            # Extract table data: parsed rows, or raw CSV text
+            raw_data = table_data.get('data') or table_data.get('content')
             if not raw_data:
                 raise ValueError("No table data provided")
             
-            # Convert to pandas DataFrame
-            df = pd.DataFrame(raw_data)
-            
-            # Infer headers if not provided
-            headers = await self.infer_headers(df)
-            
-            # Infer column types
-            column_types = await self.infer_column_types(df)
+            if isinstance(raw_data, (str, bytes)):
+                # Arrow parses and types the CSV in one multithreaded pass,
+                # and its header row names the columns
+                df = self._read_csv(raw_data)
+                profiles = self._profile_columns(df)
+                headers = [str(col) for col in df.columns]
+                column_types = await self.infer_column_types(df, profiles)
+            else:
+                # Convert to pandas DataFrame
+                df = pd.DataFrame(raw_data)
+                
+                # Null masks and samples are shared by type and unit inference
+                profiles = self._profile_columns(df)
+                
+                # Header and type inference only read df, so run them concurrently
+                headers, column_types = await asyncio.gather(
+                    self.infer_headers(df),
+                    self.infer_column_types(df, profiles)
+                )
             
-            # Detect units
-            units = await self.detect_units(df, headers)
+            # Detect units (header text is one of the unit sources)
+            units = await self.detect_units(df, headers, profiles, column_types)
             
-            # Create schema
-            schema = await self.create_schema(headers, column_types, units)
+            # Create schema, carrying the datetime formats found during inference
+            datetime_formats = {
+                col: profile.datetime_format
+                for col, profile in profiles.items() if profile.datetime_format
+            }
+            schema = await self.create_schema(headers, column_types, units, datetime_formats)
             
             # Normalize data
             normalized_data = await self.normalize_data(df, schema)
@@ -81,7 +177,8 @@ class TableWorker:
             result = {
                 'table_id': table_data.get('table_id'),
                 'schema': schema,
-                'normalized_data': normalized_data,
+                'schema_arrow': normalized_data.schema.serialize().to_pybytes(),
+                'normalized_data': table_to_ipc(normalized_data) if as_ipc else normalized_data,
                 'metadata': {
                     'row_count': len(df),
                     'column_count': len(df.columns),
@@ -104,84 +201,104 @@ class TableWorker:
     
     async def infer_headers(self, df: pd.DataFrame) -> List[str]:
         """Infer column headers from data"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_TABLE_POOL, self._infer_headers, df)
+    
+    def _infer_headers(self, df: pd.DataFrame) -> List[str]:
+        """Header inference body; runs on the table pool"""
         try:
-            headers = []
+            if len(df) == 0:
+                return [f"Column_{i+1}" for i in range(len(df.columns))]
             
-            for col_idx, col in enumerate(df.columns):
-                # Check if first row looks like a header
-                first_value = str(df.iloc[0, col_idx]) if len(df) > 0 else ""
-                
-                # Simple header detection heuristics
-                if self._looks_like_header(first_value):
-                    headers.append(first_value)
-                    # Remove header row from data
-                    df = df.iloc[1:].reset_index(drop=True)
-                else:
-                    headers.append(f"Column_{col_idx + 1}")
+            # Every column is judged on the same first row, in one vectorized pass
+            first_row = df.iloc[0].astype(str)
+            is_header = self._looks_like_header(first_row)
             
-            return headers
+            return [
+                value if flag else f"Column_{col_idx + 1}"
+                for col_idx, (value, flag) in enumerate(zip(first_row, is_header))
+            ]
             
         except Exception as e:
             self.logger.error("Header inference failed", error=str(e))
             # Fallback to generic headers
             return [f"Column_{i+1}" for i in range(len(df.columns))]
     
-    async def infer_column_types(self, df: pd.DataFrame) -> Dict[str, str]:
-        """Infer column data types"""
+    async def infer_column_types(self, df: pd.DataFrame,
+                                 profiles: Optional[Dict[Any, _ColumnProfile]] = None) -> Dict[str, str]:
+        """Infer column data types, one table pool task per column"""
         try:
-            column_types = {}
-            
-            for col in df.columns:
-                col_data = df[col].dropna()
-                
-                if len(col_data) == 0:
-                    column_types[col] = 'string'
-                    continue
-                
-                # Try to infer type
-                if self._is_numeric(col_data):
-                    if self._is_integer(col_data):
-                        column_types[col] = 'integer'
-                    else:
-                        column_types[col] = 'float'
-                elif self._is_datetime(col_data):
-                    column_types[col] = 'datetime'
-                elif self._is_boolean(col_data):
-                    column_types[col] = 'boolean'
-                else:
-                    column_types[col] = 'string'
-            
-            return column_types
+            profiles = profiles or self._profile_columns(df)
+            loop = asyncio.get_running_loop()
+            types = await asyncio.gather(*(
+                loop.run_in_executor(_TABLE_POOL, self._infer_column_type, profiles[col], df[col].dtype)
+                for col in df.columns
+            ))
+            return dict(zip(df.columns, types))
             
         except Exception as e:
             self.logger.error("Column type inference failed", error=str(e))
             # Fallback to string for all columns
             return {col: 'string' for col in df.columns}
     
-    async def detect_units(self, df: pd.DataFrame, headers: List[str]) -> Dict[str, Optional[str]]:
-        """Detect units in column headers and data"""
+    def _infer_column_type(self, profile: _ColumnProfile, dtype: Any) -> str:
+        """Type of one column; runs on the table pool"""
+        col_data = profile.sample
+        if len(col_data) == 0:
+            return 'string'
+        
+        # Arrow-parsed columns already carry their type
+        arrow_type = self._arrow_column_type(dtype)
+        if arrow_type:
+            return arrow_type
+        
+        # Try to infer type
+        numeric_type = self._classify_numeric(col_data)
+        if numeric_type:
+            return numeric_type
+        if self._is_datetime(col_data, profile):
+            return 'datetime'
+        if self._is_boolean(profile.values):
+            return 'boolean'
+        return 'string'
+    
+    async def detect_units(self, df: pd.DataFrame, headers: List[str],
+                           profiles: Optional[Dict[Any, _ColumnProfile]] = None,
+                           column_types: Optional[Dict[str, str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Detect units in column headers and data, one table pool task per column
+        
+        When column_types is given, only string columns have their values
+        probed; typed columns can't carry a unit suffix in their cells.
+        """
         try:
-            units = {}
-            
-            for col, header in zip(df.columns, headers):
-                # Check header for units
-                header_unit = self._extract_unit_from_text(header)
-                
-                if header_unit:
-                    units[col] = header_unit
-                else:
-                    # Check sample data for units
-                    sample_data = df[col].dropna().head(10)
-                    data_unit = self._extract_unit_from_data(sample_data)
-                    units[col] = data_unit
-            
-            return units
+            profiles = profiles or self._profile_columns(df)
+            loop = asyncio.get_running_loop()
+            units = await asyncio.gather(*(
+                loop.run_in_executor(
+                    _TABLE_POOL, self._detect_unit, header, profiles[col],
+                    column_types.get(col, 'string') if column_types else 'string'
+                )
+                for col, header in zip(df.columns, headers)
+            ))
+            return dict(zip(df.columns, units))
             
         except Exception as e:
             self.logger.error("Unit detection failed", error=str(e))
             return {col: None for col in df.columns}
     
-    async def create_schema(self, headers: List[str], column_types: Dict[str, str], units: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    def _detect_unit(self, header: str, profile: _ColumnProfile, column_type: str) -> Optional[str]:
+        """Unit of one column; runs on the table pool"""
+        # Check header for units
+        header_unit = self._extract_unit_from_text(header)
+        if header_unit or column_type != 'string':
+            return header_unit
+        
+        # Check sample data for units
+        return self._extract_unit_from_data(profile.non_null.head(10))
+    
+    async def create_schema(self, headers: List[str], column_types: Dict[str, str], units: Dict[str, Optional[str]],
+                            datetime_formats: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
         """Create table schema"""
         try:
             schema = {
@@ -192,21 +309,25 @@ class TableWorker:
             
             for i, header in enumerate(headers):
                 col_name = self._sanitize_column_name(header)
+                # Inference results are keyed by the original header (the df column)
+                col_type = column_types.get(header, 'string')
                 
                 column_schema = {
                     'name': col_name,
                     'original_name': header,
-                    'type': column_types.get(col_name, 'string'),
-                    'unit': units.get(col_name),
+                    'type': col_type,
+                    'unit': units.get(header),
                     'nullable': True,
                     'index': i
                 }
                 
                 # Add constraints based on type
-                if column_types.get(col_name) == 'integer':
+                if col_type == 'integer':
                     column_schema['constraints'] = ['integer_range']
-                elif column_types.get(col_name) == 'float':
+                elif col_type == 'float':
                     column_schema['constraints'] = ['float_range']
+                elif col_type == 'datetime' and datetime_formats and header in datetime_formats:
+                    column_schema['datetime_format'] = datetime_formats[header]
                 
                 schema['columns'].append(column_schema)
             
@@ -216,93 +337,182 @@ class TableWorker:
             self.logger.error("Schema creation failed", error=str(e))
             raise
     
-    async def normalize_data(self, df: pd.DataFrame, schema: Dict[str, Any]) -> List[List[Any]]:
-        """Normalize data according to schema"""
+    async def normalize_data(self, df: pd.DataFrame, schema: Dict[str, Any]) -> pa.Table:
+        """
+        Normalize data according to schema
+        
+        Returns an Arrow table with one column per schema column, named by
+        sanitized column name. Clean columns keep their type (int64, double,
+        bool, timestamp); columns with cells that don't convert become
+        strings holding the original text, so no value is lost.
+        """
         try:
-            normalized_data = []
-            
-            for _, row in df.iterrows():
-                normalized_row = []
-                
-                for col_schema in schema['columns']:
-                    col_name = col_schema['original_name']
-                    col_type = col_schema['type']
-                    
-                    value = row[col_name]
-                    
-                    # Normalize value based on type
-                    normalized_value = self._normalize_value(value, col_type)
-                    normalized_row.append(normalized_value)
-                
-                normalized_data.append(normalized_row)
-            
-            return normalized_data
+            return pa.table({
+                col_schema['name']: self._to_arrow(
+                    self._normalize_column(df[col_schema['original_name']], col_schema['type'],
+                                           col_schema.get('datetime_format'))
+                )
+                for col_schema in schema['columns']
+            })
             
         except Exception as e:
             self.logger.error("Data normalization failed", error=str(e))
             raise
     
-    def _looks_like_header(self, text: str) -> bool:
-        """Check if text looks like a column header"""
-        if not text or pd.isna(text):
-            return False
-        
-        text = str(text).strip()
+    def _to_arrow(self, values: np.ndarray) -> pa.Array:
+        """Wrap a normalized column as an Arrow array, NaN/NaT/None as nulls"""
+        try:
+            return pa.array(values, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Fallback text mixed with converted values: store it all as text
+            return pa.array([None if v is None else str(v) for v in values], type=pa.string())
+    
+    def _looks_like_header(self, first_row: pd.Series) -> np.ndarray:
+        """Check which cells of a stringified first row look like column headers"""
+        text = first_row.str.strip()
         
         # Header indicators
         header_indicators = [
-            len(text) < 50,  # Short text
-            text.isupper() or text.istitle(),  # Capitalized
-            not text.replace('.', '').replace(',', '').replace(' ', '').isdigit(),  # Not just numbers
-            any(word in text.lower() for word in ['name', 'id', 'type', 'value', 'unit', 'date', 'time'])
+            text.str.len() < 50,  # Short text
+            text.str.isupper() | text.str.istitle(),  # Capitalized
+            ~text.str.replace(r'[., ]', '', regex=True).str.isdigit(),  # Not just numbers
+            text.str.contains(_HEADER_WORDS_RE)
         ]
         
-        return sum(header_indicators) >= 2
+        score = np.sum([indicator.to_numpy(dtype=bool) for indicator in header_indicators], axis=0)
+        return (score >= 2) & (first_row.str.len() > 0).to_numpy()
     
-    def _is_numeric(self, series: pd.Series) -> bool:
-        """Check if series contains numeric data"""
+    def _classify_numeric(self, series: pd.Series) -> Optional[str]:
+        """
+        'integer' or 'float' if a non-null series is numeric, else None
+        
+        One coercing conversion answers both questions: any NaN means a
+        value failed to parse, and finite integral data is unchanged by
+        trunc (infinities are too, so they make a column float).
+        """
         try:
-            pd.to_numeric(series, errors='raise')
-            return True
+            values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
         except (ValueError, TypeError):
-            return False
+            return None
+        
+        if np.isnan(values).any():
+            return None
+        integral = np.isfinite(values).all() and np.array_equal(values, np.trunc(values))
+        return 'integer' if integral else 'float'
     
-    def _is_integer(self, series: pd.Series) -> bool:
-        """Check if series contains integer data"""
-        try:
-            numeric_series = pd.to_numeric(series, errors='coerce')
-            return (numeric_series % 1 == 0).all()
-        except (ValueError, TypeError):
-            return False
+    def _read_csv(self, raw_data: Union[str, bytes]) -> pd.DataFrame:
+        """Parse CSV text with Arrow, keeping Arrow-backed column types"""
+        if isinstance(raw_data, str):
+            raw_data = raw_data.encode('utf-8')
+        table = pa_csv.read_csv(pa.BufferReader(raw_data))
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
     
-    def _is_datetime(self, series: pd.Series) -> bool:
-        """Check if series contains datetime data"""
+    def _arrow_column_type(self, dtype: Any) -> Optional[str]:
+        """Schema type for an Arrow-backed column, or None if it needs inference"""
+        if not isinstance(dtype, pd.ArrowDtype):
+            return None
+        
+        arrow_type = dtype.pyarrow_dtype
+        if pa.types.is_integer(arrow_type):
+            return 'integer'
+        if pa.types.is_floating(arrow_type):
+            return 'float'
+        if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+            return 'datetime'
+        if pa.types.is_boolean(arrow_type):
+            return 'boolean'
+        # Strings may still hold booleans Arrow doesn't recognize (yes/no, y/n)
+        return None
+    
+    def _profile_columns(self, df: pd.DataFrame) -> Dict[Any, _ColumnProfile]:
+        """Drop nulls and draw the type-inference sample once per column"""
+        profiles = {}
+        for col in df.columns:
+            non_null = df[col].dropna()
+            sample = self._type_sample(non_null)
+            profiles[col] = _ColumnProfile(non_null=non_null, sample=sample, values=sample.to_numpy())
+        return profiles
+    
+    def _type_sample(self, series: pd.Series) -> pd.Series:
+        """
+        Bounded sample of a column for type inference
+        
+        Columns up to TYPE_SAMPLE_SIZE values are used whole; longer ones
+        are probed through their head, tail and a fixed random middle, so
+        inference cost stops growing with row count.
+        """
+        if len(series) <= TYPE_SAMPLE_SIZE:
+            return series
+        
+        edge = TYPE_SAMPLE_SIZE // 5
+        middle = series.iloc[edge:-edge].sample(TYPE_SAMPLE_SIZE - 2 * edge, random_state=0)
+        return pd.concat([series.head(edge), middle, series.tail(edge)])
+    
+    def _is_datetime(self, series: pd.Series, profile: Optional[_ColumnProfile] = None) -> bool:
+        """
+        Check if series contains datetime data
+        
+        A recognized layout is parsed with its explicit format and recorded
+        on the profile, so normalization can reuse it.
+        """
+        probe = series.head(5).astype(str).str.strip()
+        
+        # Every date spelling has a digit; skip the full parse for word columns
+        if not probe.str.contains(r'\d', regex=True).all():
+            return False
+        
+        datetime_format = self._detect_datetime_format(probe)
         try:
-            pd.to_datetime(series, errors='raise')
-            return True
+            pd.to_datetime(series, errors='raise', format=datetime_format)
         except (ValueError, TypeError):
-            return False
+            if datetime_format is None:
+                return False
+            # The layout matched but the values don't parse with it (e.g.
+            # day-first dates under %m/%d/%Y); let pandas infer the format
+            datetime_format = None
+            try:
+                pd.to_datetime(series, errors='raise')
+            except (ValueError, TypeError):
+                return False
+        
+        if profile is not None:
+            profile.datetime_format = datetime_format
+        return True
     
-    def _is_boolean(self, series: pd.Series) -> bool:
-        """Check if series contains boolean data"""
-        unique_values = series.unique()
-        boolean_indicators = ['true', 'false', 'yes', 'no', '1', '0', 't', 'f', 'y', 'n']
+    def _detect_datetime_format(self, probe: pd.Series) -> Optional[str]:
+        """Explicit format matched by at least 4 of the probe values (all, if fewer)"""
+        needed = min(4, len(probe))
+        for pattern, datetime_format in _DATETIME_FORMATS:
+            if sum(pattern.fullmatch(value) is not None for value in probe) >= needed:
+                return datetime_format
+        return None
+    
+    def _is_boolean(self, values: np.ndarray) -> bool:
+        """Check if an array of non-null values contains boolean data"""
+        # Hash-based, so mixed-type object arrays work (np.unique would sort)
+        unique_values = pd.unique(values)
+        # Even with every casing of every spelling, a boolean column has
+        # few distinct values; reject high-cardinality columns unseen
+        if len(unique_values) > _MAX_BOOLEAN_UNIQUES:
+            return False
         
-        return all(str(v).lower() in boolean_indicators for v in unique_values)
+        return _BOOLEAN_VALUES.issuperset(str(v).lower() for v in unique_values)
     
     def _extract_unit_from_text(self, text: str) -> Optional[str]:
         """Extract unit from text using UCUM patterns"""
+        match = self._match_unit(text)
+        return match[1] if match else None
+    
+    def _match_unit(self, text: str) -> Optional[Tuple[str, str]]:
+        """First UCUM unit in text as (unit type, unit), in one regex scan"""
         if not text:
             return None
         
-        text = str(text).lower()
-        
-        for unit_type, pattern in self.ucum_patterns.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            if matches:
-                return matches[0]
+        m = _UCUM_RE.search(str(text).lower())
+        if m is None:
+            return None
         
-        return None
+        return m.lastgroup, m.group(m.lastgroup)
     
     def _extract_unit_from_data(self, series: pd.Series) -> Optional[str]:
         """Extract unit from data values"""
@@ -318,10 +528,8 @@ class TableWorker:
     
     def _sanitize_column_name(self, name: str) -> str:
         """Sanitize column name for database use"""
-        # Remove special characters and replace spaces with underscores
-        sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', name)
-        sanitized = re.sub(r'_+', '_', sanitized)  # Replace multiple underscores with single
-        sanitized = sanitized.strip('_')  # Remove leading/trailing underscores
+        # Collapse each run of special characters/underscores into one underscore
+        sanitized = _SANITIZE_RE.sub('_', name).strip('_')
         
         # Ensure it starts with a letter
         if sanitized and not sanitized[0].isalpha():
@@ -329,21 +537,58 @@ class TableWorker:
         
         return sanitized.lower()
     
-    def _normalize_value(self, value: Any, target_type: str) -> Any:
-        """Normalize value to target type"""
-        if pd.isna(value):
-            return None
+    def _normalize_boolean(self, series: pd.Series) -> pd.arrays.BooleanArray:
+        """
+        Normalize a boolean column as a nullable boolean array
         
-        try:
+        Boolean columns have a handful of distinct spellings, so only the
+        uniques are stringified and looked up; rows take their value by
+        category code, and missing cells (code -1) become the mask.
+        """
+        codes, uniques = pd.factorize(series)
+        truthy = np.fromiter((str(u).lower() in _TRUE_VALUES for u in uniques), dtype=bool, count=len(uniques))
+        # Trailing False gives code -1 something to index; those rows are masked
+        values = np.append(truthy, False)[codes]
+        return pd.arrays.BooleanArray(values, codes < 0)
+    
+    def _normalize_column(self, series: pd.Series, target_type: str,
+                          datetime_format: Optional[str] = None) -> Union[np.ndarray, pd.arrays.BooleanArray]:
+        """
+        Normalize a column to target type with one vectorized conversion
+        
+        See normalize_data for the array types; only missing or
+        unconvertible cells are touched one by one.
+        """
+        missing = series.isna().to_numpy()
+        failed = np.zeros(len(series), dtype=bool)
+        
+        if target_type in ('integer', 'float'):
+            numeric = pd.to_numeric(series, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
             if target_type == 'integer':
-                return int(float(value))
-            elif target_type == 'float':
-                return float(value)
-            elif target_type == 'datetime':
-                return pd.to_datetime(value).isoformat()
-            elif target_type == 'boolean':
-                return bool(value) if value in [True, False, 1, 0] else str(value).lower() in ['true', 'yes', '1', 't', 'y']
+                finite = np.isfinite(numeric)
+                values = np.trunc(np.where(finite, numeric, 0)).astype(np.int64)
+                failed = ~finite & ~missing
+                if not missing.any() and not failed.any():
+                    return values
             else:
-                return str(value)
-        except (ValueError, TypeError):
-            return str(value)
+                failed = np.isnan(numeric) & ~missing
+                if not failed.any():
+                    return numeric  # NaN already marks missing cells
+                values = numeric
+        elif target_type == 'datetime':
+            parsed = pd.to_datetime(series, errors='coerce', format=datetime_format or 'mixed')
+            failed = parsed.isna().to_numpy() & ~missing
+            if not failed.any():
+                return parsed.to_numpy()  # NaT already marks missing cells
+            values = parsed.dt.strftime('%Y-%m-%dT%H:%M:%S').to_numpy(dtype=object)
+        elif target_type == 'boolean':
+            return self._normalize_boolean(series)
+        else:
+            values = series.astype(str).to_numpy(dtype=object)
+        
+        values = values.astype(object)
+        values[missing] = None
+        for i in np.flatnonzero(failed):
+            values[i] = str(series.iat[i])
+        
+        return values
@@ -0,0 +1,64 @@
+import pytest
+import numpy as np
+from unittest.mock import AsyncMock
+from workers.src.workers.embed_worker.embed_worker import EmbedWorker
+
+
+def _unit_vectors(n, dims=8):
+    vectors = np.random.default_rng(0).standard_normal((n, dims)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestEmbeddingRecordShape:
+    @pytest.mark.asyncio
+    async def test_float32_chunks_keep_plain_float_lists(self):
+        worker = EmbedWorker()
+        embeddings = _unit_vectors(2)
+        worker._process_embeddings = AsyncMock(return_value=embeddings)
+        chunks_data = {'document_id': 'doc-1', 'chunks': [{'text': 'a'}, {'text': 'b'}]}
+
+        result = await worker.process_chunks(chunks_data)
+
+        for chunk, expected in zip(result['chunks'], embeddings):
+            assert set(chunk) == {'text', 'embedding'}
+            assert isinstance(chunk['embedding'], list)
+            assert np.array_equal(np.asarray(chunk['embedding'], dtype=np.float32), expected)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('precision,atol', [('float16', 1e-3), ('int8', 1e-2)])
+    async def test_reduced_precision_round_trips_to_float32(self, precision, atol):
+        worker = EmbedWorker(embedding_precision=precision)
+        embeddings = _unit_vectors(3)
+        worker._process_embeddings = AsyncMock(return_value=embeddings)
+        chunks_data = {'document_id': 'doc-1', 'chunks': [{'text': str(i)} for i in range(3)]}
+
+        result = await worker.process_chunks(chunks_data)
+
+        for chunk, expected in zip(result['chunks'], embeddings):
+            assert chunk['embedding_dtype'] == precision
+            decoded = np.asarray(chunk['embedding'], dtype=chunk['embedding_dtype']).astype(np.float32)
+            decoded *= chunk.get('embedding_scale', 1.0)
+            assert np.allclose(decoded, expected, atol=atol)
+
+    @pytest.mark.asyncio
+    async def test_tables_get_schema_and_content_embeddings(self):
+        worker = EmbedWorker()
+        embeddings = _unit_vectors(4)
+        worker._process_embeddings = AsyncMock(return_value=embeddings)
+        tables = [
+            {'id': f't{i}', 'schema': {'columns': [{'name': 'x', 'type': 'float'}]}, 'data': [['x'], [1.0]]}
+            for i in range(2)
+        ]
+
+        result = await worker.process_tables({'document_id': 'doc-1', 'tables': tables})
+
+        requests = worker._process_embeddings.call_args.args[0]
+        assert [request.type for request in requests] == ['table_schema', 'table_content'] * 2
+        for i, table in enumerate(result['tables']):
+            assert 'embedding' not in table
+            assert np.array_equal(np.asarray(table['schema_embedding'], dtype=np.float32), embeddings[2 * i])
+            assert np.array_equal(np.asarray(table['content_embedding'], dtype=np.float32), embeddings[2 * i + 1])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -1,7 +1,8 @@
 import pytest
 import asyncio
+from types import SimpleNamespace
 from unittest.mock import Mock, patch
-from workers.src.workers.pdf_worker.pdf_worker import PDFWorker
+from workers.src.workers.pdf_worker.pdf_worker import PDFWorker, _token_pieces
 
 
 class TestPDFWorker:
@@ -213,5 +214,41 @@ class TestPDFWorker:
         assert len(result['chunks']) > 0
 
 
+class TestTokenPieces:
+    @staticmethod
+    def _encoding(words):
+        """Fake WordPiece encoding: each word is a list of token lengths, words one space apart"""
+        offsets, word_ids, pos = [], [], 0
+        for word_id, pieces in enumerate(words):
+            for length in pieces:
+                offsets.append((pos, pos + length))
+                word_ids.append(word_id)
+                pos += length
+            pos += 1
+        return SimpleNamespace(offsets=offsets, word_ids=word_ids)
+
+    def test_pieces_respect_limit_and_cover_all_tokens(self):
+        encoding = self._encoding([[3]] * 10)
+
+        pieces = list(_token_pieces(encoding, 4))
+
+        assert [tokens for _, _, tokens in pieces] == [4, 4, 2]
+        assert pieces[0][:2] == (0, 15)
+        assert pieces[-1][1] == encoding.offsets[-1][1]
+
+    def test_cuts_fall_between_words(self):
+        # Words of 2, 3 and 2 subword tokens: a 4-token window backs off to the word start
+        encoding = self._encoding([[2, 2], [2, 2, 2], [2, 2]])
+
+        pieces = list(_token_pieces(encoding, 4))
+
+        assert [tokens for _, _, tokens in pieces] == [2, 3, 2]
+
+    def test_word_longer_than_window_is_cut_inside(self):
+        encoding = self._encoding([[1] * 6])
+
+        assert [tokens for _, _, tokens in _token_pieces(encoding, 4)] == [4, 2]
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
@@ -0,0 +1,101 @@
+import io
+import zipfile
+
+import pytest
+from workers.src.workers.bundle_worker.zip_stream import ZipStreamWriter, compress_entry
+
+
+class _ForwardOnlySink:
+    """Sink with only write(), like a socket or multipart upload"""
+
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def write(self, data):
+        return self.buffer.write(data)
+
+
+def _read_back(sink):
+    return zipfile.ZipFile(io.BytesIO(sink.buffer.getvalue()))
+
+
+class TestZipStreamWriter:
+    def test_stored_and_deflated_entries(self):
+        sink = _ForwardOnlySink()
+        payload = b"experiment,value\n" * 1000
+
+        with ZipStreamWriter(sink) as writer:
+            writer.write("data/stored.csv", payload, compress=False)
+            writer.write("data/deflated.csv", payload)
+
+        with _read_back(sink) as archive:
+            assert archive.testzip() is None
+            stored = archive.getinfo("data/stored.csv")
+            deflated = archive.getinfo("data/deflated.csv")
+            assert stored.compress_type == zipfile.ZIP_STORED
+            assert deflated.compress_type == zipfile.ZIP_DEFLATED
+            assert deflated.compress_size < len(payload)
+            assert archive.read("data/stored.csv") == payload
+            assert archive.read("data/deflated.csv") == payload
+
+    def test_precompressed_entries(self):
+        sink = _ForwardOnlySink()
+        payload = "ünïcode ✓".encode("utf-8") * 100
+        method, compressed, crc, file_size = compress_entry(payload)
+
+        with ZipStreamWriter(sink) as writer:
+            writer.write_compressed("notes/ünïcode.txt", compressed, crc, file_size, method)
+
+        with _read_back(sink) as archive:
+            assert archive.namelist() == ["notes/ünïcode.txt"]
+            assert archive.read("notes/ünïcode.txt") == payload
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_streamed_entry_with_forced_zip64(self, compress):
+        sink = _ForwardOnlySink()
+        lines = [b'{"source": "doc-%d", "target": "exp-%d"}\n' % (i, i) for i in range(5000)]
+
+        with ZipStreamWriter(sink) as writer:
+            writer.write("README.md", b"# Bundle\n")
+            with writer.open("relationships.jsonl", compress=compress, force_zip64=True) as handle:
+                for line in lines:
+                    handle.write(line)
+            writer.write("manifest.json", b"{}")
+
+        with _read_back(sink) as archive:
+            assert archive.testzip() is None
+            assert archive.namelist() == ["README.md", "relationships.jsonl", "manifest.json"]
+            info = archive.getinfo("relationships.jsonl")
+            assert info.file_size == sum(len(line) for line in lines)
+            assert archive.read("relationships.jsonl") == b"".join(lines)
+            assert archive.read("manifest.json") == b"{}"
+
+    def test_more_than_65535_entries(self):
+        sink = _ForwardOnlySink()
+        count = 0xFFFF + 10
+
+        with ZipStreamWriter(sink) as writer:
+            for i in range(count):
+                writer.write(f"chunks/{i}.txt", str(i).encode(), compress=False)
+
+        with _read_back(sink) as archive:
+            names = archive.namelist()
+            assert len(names) == count
+            assert names[-1] == f"chunks/{count - 1}.txt"
+            assert archive.read(f"chunks/{count - 1}.txt") == str(count - 1).encode()
+
+    def test_rejects_writes_while_stream_open(self):
+        writer = ZipStreamWriter(_ForwardOnlySink())
+        handle = writer.open("open.txt")
+
+        with pytest.raises(ValueError):
+            writer.write("other.txt", b"x")
+
+        handle.close()
+        writer.close()
+        with pytest.raises(ValueError):
+            writer.write("late.txt", b"x")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])